@@ -0,0 +1,53 @@
+# cs412/charts.py
+# Ting Shing Liu, 10/18/26
+# Loading plotly.js once per page from a fingerprinted static file
+
+import hashlib
+import os
+from functools import lru_cache
+import plotly
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+
+
+@lru_cache(maxsize=None)
+def plotly_js_name():
+    """
+    Returns the static path of the plotly.js bundle shipped with the
+    installed plotly package, e.g. 'js/plotly-4.1.1.0123456789ab.min.js'.
+
+    The name carries a hash of the file's contents, so it changes
+    whenever plotly is upgraded and can be cached by browsers for good
+    (see middleware.FingerprintedStaticCacheMiddleware).
+    """
+    digest = hashlib.sha256(plotly.offline.get_plotlyjs().encode('utf-8')).hexdigest()[:12]
+    return f"js/plotly-{plotly.offline.get_plotlyjs_version()}.{digest}.min.js"
+
+
+def write_plotly_js(directory=None):
+    """
+    Writes the plotly.js bundle to `directory` (default: the first of
+    STATICFILES_DIRS) under plotly_js_name(). Returns the file's path.
+    """
+    if directory is None:
+        directory = settings.STATICFILES_DIRS[0]
+    path = os.path.join(directory, plotly_js_name())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(plotly.offline.get_plotlyjs())
+    return path
+
+
+@lru_cache(maxsize=None)
+def plotly_js_url():
+    """
+    Returns the URL to load plotly.js from: the fingerprinted static
+    file if `manage.py vendor_plotlyjs` has written it (at deploy time,
+    before collectstatic), otherwise the Plotly CDN copy of the same
+    version.
+    """
+    if finders.find(plotly_js_name()):
+        return static(plotly_js_name())
+    return f"https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"
+
@@ -0,0 +1,151 @@
+# cs412/ingest.py
+# Ting Shing Liu, 10/18/26
+# Shared helpers for loading large CSV files into the analytics apps
+
+import csv
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Target size of one chunk of the input file handed to a worker process
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+class RejectWriter:
+    """
+    Writes rows that failed validation to a side CSV file, along with
+    the line number and the reason they were rejected.
+
+    The file is only created once the first row is rejected.
+    """
+
+    def __init__(self, filename, columns):
+        self.filename = filename
+        self.columns = columns
+        self.count = 0
+        self.file = None
+        self.writer = None
+
+    def write(self, line_number, fields, error):
+        """Record one rejected row."""
+        if self.writer is None:
+            self.file = open(self.filename, 'w', newline='', encoding='utf-8')
+            self.writer = csv.writer(self.file)
+            self.writer.writerow(['line'] + list(self.columns) + ['error'])
+        self.writer.writerow([line_number] + list(fields) + [str(error)])
+        self.count += 1
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+def split_file(filename, chunk_size=CHUNK_SIZE):
+    """
+    Splits `filename` into (start, end) byte ranges of roughly
+    `chunk_size` bytes. Every range starts at the beginning of a line and
+    ends just after a newline, and the header line is left out.
+    """
+    size = os.path.getsize(filename)
+    ranges = []
+    with open(filename, 'rb') as f:
+        f.readline() # skip headers
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            if f.tell() < size:
+                f.readline() # move to the end of the current line
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_chunk(filename, start, end, parse_row, with_source=False):
+    """
+    Parses the lines in bytes [start, end) of `filename` with `parse_row`.
+
+    Runs in a worker process, so `parse_row` must be a module-level
+    function. Returns (rows, rejects, line_count), where rejects holds
+    (line offset within the chunk, fields, error message) tuples. With
+    with_source=True each row is a (line offset, fields, row) tuple.
+    """
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    rows = []
+    rejects = []
+    reader = csv.reader(io.StringIO(data.decode('utf-8'), newline=''))
+    for fields in reader:
+        if not fields:
+            continue
+        try:
+            row = parse_row(fields)
+        except ValueError as e:
+            rejects.append((reader.line_num, fields, str(e)))
+            continue
+        rows.append((reader.line_num, fields, row) if with_source else row)
+    return rows, rejects, reader.line_num
+
+
+def read_rows(filename, parse_row, rejects, with_source=False):
+    """
+    Streams `filename` through the csv module in this process and yields
+    parse_row(fields) for every valid row, or (line number, fields, row)
+    tuples with with_source=True. Invalid rows go to `rejects`.
+    """
+    with open(filename, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        next(reader, None) # discard headers
+        for fields in reader:
+            if not fields:
+                continue
+            try:
+                row = parse_row(fields)
+            except ValueError as e:
+                rejects.write(reader.line_num, fields, e)
+                continue
+            yield (reader.line_num, fields, row) if with_source else row
+
+
+def read_rows_parallel(filename, parse_row, rejects, workers, chunk_size=CHUNK_SIZE,
+                       with_source=False):
+    """
+    Like read_rows(), but parses the file in `workers` processes.
+
+    The file is split into line-aligned byte ranges which are parsed in
+    a ProcessPoolExecutor. Rows are yielded back in file order so the
+    caller can remain the single database writer, and at most two chunks
+    per worker are in flight to bound memory use.
+    """
+    ranges = deque(split_file(filename, chunk_size))
+    line_number = 1 # the header line
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while ranges or pending:
+            while ranges and len(pending) < workers * 2:
+                start, end = ranges.popleft()
+                pending.append(executor.submit(parse_chunk, filename, start, end, parse_row, with_source))
+
+            rows, chunk_rejects, line_count = pending.popleft().result()
+            for offset, fields, error in chunk_rejects:
+                rejects.write(line_number + offset, fields, error)
+            if with_source:
+                for offset, fields, row in rows:
+                    yield line_number + offset, fields, row
+            else:
+                yield from rows
+            line_number += line_count
+
+
+def iter_rows(filename, parse_row, rejects, workers=1, with_source=False):
+    """
+    Yields the parsed rows of `filename`, in parallel if workers > 1.
+    With with_source=True, yields (line number, fields, row) tuples so the
+    caller can still reject a row that parsed cleanly.
+    """
+    if workers > 1:
+        return read_rows_parallel(filename, parse_row, rejects, workers, with_source=with_source)
+    return read_rows(filename, parse_row, rejects, with_source)
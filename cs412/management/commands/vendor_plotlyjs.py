@@ -0,0 +1,28 @@
+# cs412/management/commands/vendor_plotlyjs.py
+# Ting Shing Liu, 10/18/26
+# manage.py command to copy plotly.js into static/ under a fingerprinted name
+
+import glob
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from cs412.charts import plotly_js_name, write_plotly_js
+
+
+class Command(BaseCommand):
+    help = ("Write the installed plotly.js bundle to static/ under a fingerprinted name. "
+            "The bundle is not kept in git: run this before collectstatic when deploying.")
+
+    def handle(self, *args, **options):
+        directory = settings.STATICFILES_DIRS[0]
+        path = write_plotly_js(directory)
+
+        # remove bundles left over from earlier plotly versions
+        pattern = os.path.join(directory, os.path.dirname(plotly_js_name()), 'plotly-*.min.js')
+        for old in glob.glob(pattern):
+            if os.path.abspath(old) != os.path.abspath(path):
+                os.remove(old)
+                self.stdout.write(f"Removed {old}")
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}"))
+        self.stdout.write("Run collectstatic to publish it.")
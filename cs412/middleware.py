@@ -0,0 +1,34 @@
+# cs412/middleware.py
+# Ting Shing Liu, 10/18/26
+# Long-lived browser caching of static files whose names carry a content hash
+
+import re
+from django.templatetags.static import static
+from django.utils.cache import patch_cache_control
+
+# A content hash in a static file's name, as in charts.plotly_js_name()
+FINGERPRINT = re.compile(r'\.[0-9a-f]{12}\.min\.js$')
+
+# One year, the longest max-age browsers honour
+FINGERPRINTED_MAX_AGE = 365 * 24 * 60 * 60
+
+
+class FingerprintedStaticCacheMiddleware:
+    """
+    Marks static files with a content hash in their name as cacheable for
+    a year without revalidation, since a new version gets a new name.
+
+    Applies when the static files are served through Django's URLs (see
+    cs412/urls.py). `manage.py runserver` serves them before any
+    middleware runs, so there the headers are not added.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.status_code == 200 and request.path.startswith(static(''))
+                and FINGERPRINT.search(request.path)):
+            patch_cache_control(response, public=True, max_age=FINGERPRINTED_MAX_AGE, immutable=True)
+        return response
@@ -0,0 +1,43 @@
+# cs412/pagination.py
+# Ting Shing Liu, 10/18/26
+# Pagination with the total row count served from the cache
+
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from .generations import get_or_compute
+
+
+class CachedCountPaginator(Paginator):
+    """
+    A Paginator that reads its total count from the cache under
+    `count_key`, and only runs COUNT(*) on a cache miss. Without a key it
+    behaves like Django's Paginator.
+    """
+
+    def __init__(self, object_list, per_page, count_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self):
+        if self.count_key is None:
+            return Paginator.count.func(self)
+        return get_or_compute(self.count_key, lambda: Paginator.count.func(self))
+
+
+class CachedCountMixin:
+    """
+    ListView mixin that paginates with CachedCountPaginator. Views
+    provide get_count_key(), which must change whenever the count can:
+    with the filters in use and with the table's load generation.
+    """
+    paginator_class = CachedCountPaginator
+
+    def get_count_key(self):
+        """Returns the cache key of the current count, or None to skip the cache."""
+        return None
+
+    def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        return self.paginator_class(queryset, per_page, orphans=orphans,
+                                    allow_empty_first_page=allow_empty_first_page,
+                                    count_key=self.get_count_key(), **kwargs)
@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'cs412', # Shared helpers and management commands (vendor_plotlyjs)
     'hw', # Module1
     'quotes', # Assignment1
     'formdata', # Module2
@@ -48,10 +49,12 @@ INSTALLED_APPS = [
     'rest_framework', #Django REST Framework for API development
     'dadjokes', #Assignment10
     'project', #Project app
+    'jobs', #Background jobs (exports)
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'cs412.middleware.FingerprintedStaticCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -157,4 +160,8 @@ REST_FRAMEWORK = {
   'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
   'PAGE_SIZE': 10
 }
- 
\ No newline at end of file
+ 
+# How voter_analytics answers the filter form: 'orm' queries the database,
+# 'columnar' filters an in-memory NumPy snapshot (falls back to 'orm'
+# when NumPy is not installed), 'bitmap' intersects in-memory bitmaps
+VOTER_ANALYTICS_ENGINE = 'orm'
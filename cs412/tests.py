@@ -0,0 +1,184 @@
+# cs412/tests.py
+# Ting Shing Liu, 10/18/26
+# Tests for the helpers shared by the analytics apps
+
+import io
+import os
+import tempfile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.templatetags.static import static
+from voter_analytics.models import Party, VoterSummary
+from .charts import plotly_js_name
+from .histograms import histogram
+from .ingest import RejectWriter, iter_rows, read_rows, read_rows_parallel, split_file
+from .middleware import FingerprintedStaticCacheMiddleware
+from .pagination import CachedCountPaginator
+
+
+def parse_pair(fields):
+    """Parses a (name, number) row; module-level so worker processes can use it."""
+    if len(fields) != 2:
+        raise ValueError(f"expected 2 columns, got {len(fields)}")
+    return (fields[0], int(fields[1]))
+
+
+class IngestTests(TestCase):
+    """Parallel parsing must give the same rows and reject lines as parsing in one process."""
+
+    def write(self, text):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'rows.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def parse(self, path, read):
+        """Returns (rows, rejects) from `read`(path, parse_pair, rejects)."""
+        rejects = RejectWriter(path + '.rejects.csv', ['name', 'number'])
+        rows = list(read(path, parse_pair, rejects))
+        rejects.close()
+        if not rejects.count:
+            return rows, []
+        with open(rejects.filename, newline='', encoding='utf-8') as f:
+            return rows, f.read().splitlines()[1:]
+
+    def sample_files(self):
+        lines = ['name,number'] + [f'row{i},{i}' for i in range(40)]
+        lines[5] = 'bad,five'
+        lines[17] = 'too,many,columns'
+        lines[-1] = 'last,x'
+        body = '\n'.join(lines)
+        return {
+            'trailing newline': self.write(body + '\n'),
+            'no trailing newline': self.write(body),
+            'CRLF': self.write('\r\n'.join(lines)),
+        }
+
+    def test_parallel_matches_serial(self):
+        for name, path in self.sample_files().items():
+            serial = self.parse(path, read_rows)
+            self.assertEqual(len(serial[0]), 37)
+            self.assertEqual([line.split(',')[0] for line in serial[1]], ['6', '18', '41'])
+            for chunk_size in [1, 7, 50, 4096]:
+                with self.subTest(file=name, chunk_size=chunk_size):
+                    parallel = self.parse(path, lambda *args: read_rows_parallel(*args, workers=2,
+                                                                                   chunk_size=chunk_size))
+                    self.assertEqual(parallel, serial)
+
+    def test_with_source_line_numbers_match(self):
+        path = self.sample_files()['no trailing newline']
+        rejects = RejectWriter(path + '.rejects.csv', ['name', 'number'])
+        self.addCleanup(rejects.close)
+        serial = list(iter_rows(path, parse_pair, rejects, with_source=True))
+        parallel = list(read_rows_parallel(path, parse_pair, rejects, workers=3, chunk_size=20, with_source=True))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(serial[0], (2, ['row0', '0'], ('row0', 0)))
+        self.assertEqual(serial[-1][0], 40)
+
+    def test_split_file_is_line_aligned(self):
+        for name, path in self.sample_files().items():
+            with open(path, 'rb') as f:
+                data = f.read()
+            for chunk_size in [1, 7, 50, 4096]:
+                with self.subTest(file=name, chunk_size=chunk_size):
+                    ranges = split_file(path, chunk_size)
+                    self.assertEqual(ranges[0][0], data.index(b'\n') + 1)
+                    self.assertEqual(ranges[-1][1], len(data))
+                    for (start, end), (next_start, next_end) in zip(ranges, ranges[1:]):
+                        self.assertEqual(end, next_start)
+                        self.assertEqual(data[end - 1:end], b'\n')
+
+
+class HistogramTests(TestCase):
+    """Bins VoterSummary rows by birth year, counting rows or summing `count`."""
+
+    def setUp(self):
+        party = Party.objects.create(code='D')
+        # (birth year, count): the edges of the 1980 and 1990 decades
+        for year, count in [(1979, 1), (1980, 2), (1989, 3), (1990, 4), (1999, 5)]:
+            VoterSummary.objects.create(party=party, birth_year=year, voter_score=0,
+                                        participation_mask=0, count=count)
+
+    def test_bin_width_one_is_one_bin_per_value(self):
+        self.assertEqual(histogram(VoterSummary.objects.all(), 'birth_year'),
+                         [(1979, 1), (1980, 1), (1989, 1), (1990, 1), (1999, 1)])
+
+    def test_bins_start_on_multiples_of_the_width(self):
+        # a value on a multiple starts its bin; the one before ends the previous bin
+        self.assertEqual(histogram(VoterSummary.objects.all(), 'birth_year', 10),
+                         [(1970, 1), (1980, 2), (1990, 2)])
+
+    def test_last_bin_includes_the_largest_value(self):
+        bins = histogram(VoterSummary.objects.all(), 'birth_year', 10, weight='count')
+        self.assertEqual(bins, [(1970, 1), (1980, 5), (1990, 9)])
+        self.assertEqual(sum(count for start, count in bins), 15)
+
+    def test_empty_queryset_has_no_bins(self):
+        self.assertEqual(histogram(VoterSummary.objects.none(), 'birth_year', 5), [])
+        self.assertEqual(histogram(VoterSummary.objects.filter(birth_year__gt=2000), 'birth_year', 5,
+                                   weight='count'), [])
+
+    def test_bin_width_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            histogram(VoterSummary.objects.all(), 'birth_year', 0)
+
+
+class CachedCountPaginatorTests(TestCase):
+    """The total count is read from the cache under its key, so COUNT(*) runs once per key."""
+
+    def setUp(self):
+        cache.clear()
+        Party.objects.bulk_create(Party(code=code) for code in ['D', 'R', 'U'])
+
+    def page(self, count_key, number=1):
+        """Returns the codes on one page of two parties, paginated with `count_key`."""
+        paginator = CachedCountPaginator(Party.objects.order_by('code'), 2, count_key=count_key)
+        page = paginator.page(number)
+        return [party.code for party in page], paginator.count
+
+    def test_repeat_page_skips_the_count(self):
+        # a miss runs COUNT(*) and reads the page
+        with self.assertNumQueries(2):
+            self.assertEqual(self.page('parties:1', 2), (['U'], 3))
+        # a hit only reads the page, from any paginator using the key
+        with self.assertNumQueries(1):
+            self.assertEqual(self.page('parties:1', 2), (['U'], 3))
+
+    def test_new_key_counts_again(self):
+        self.assertEqual(self.page('parties:1')[1], 3)
+        Party.objects.create(code='J')
+        # the cached count stays until the key changes, e.g. with the next load generation
+        self.assertEqual(self.page('parties:1')[1], 3)
+        self.assertEqual(self.page('parties:2')[1], 4)
+
+    def test_without_a_key_every_paginator_counts(self):
+        for _ in range(2):
+            with self.assertNumQueries(2):
+                self.assertEqual(self.page(None, 2), (['U'], 3))
+
+
+class PlotlyJsTests(TestCase):
+    """The plotly.js bundle is written on demand and cached by browsers for good."""
+
+    def cache_control(self, path, status=200):
+        middleware = FingerprintedStaticCacheMiddleware(lambda request: HttpResponse(status=status))
+        return middleware(RequestFactory().get(path)).get('Cache-Control')
+
+    def test_fingerprinted_static_files_are_immutable(self):
+        cache_control = self.cache_control(static(plotly_js_name()))
+        self.assertIn('immutable', cache_control)
+        self.assertIn('max-age=31536000', cache_control)
+
+    def test_other_responses_are_left_alone(self):
+        self.assertIsNone(self.cache_control(static('styles.css')))
+        self.assertIsNone(self.cache_control('/voter_analytics/' + os.path.basename(plotly_js_name())))
+        self.assertIsNone(self.cache_control(static(plotly_js_name()), status=404))
+
+    def test_vendor_plotlyjs_writes_the_bundle(self):
+        with tempfile.TemporaryDirectory() as directory, override_settings(STATICFILES_DIRS=[directory]):
+            call_command('vendor_plotlyjs', stdout=io.StringIO())
+            self.assertTrue(os.path.isfile(os.path.join(directory, plotly_js_name())))
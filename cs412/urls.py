@@ -31,6 +31,7 @@ urlpatterns = [
     path('voter_analytics/', include('voter_analytics.urls')), # The link with the voter_analytics path will get redirected to the voter_analytics app
     path('dadjokes/', include('dadjokes.urls')), # The link with the dadjokes path will get redirected to the dadjokes app
     path('project/', include('project.urls')), # The link with the project path will get redirected to the project app
+    path('jobs/', include('jobs.urls')), # The link with the jobs path will get redirected to the jobs app
 ] 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -0,0 +1,80 @@
+# jobs/handlers.py
+# Ting Shing Liu, 10/18/26
+# The kinds of background job and the functions that run them
+
+import csv
+import os
+from django.conf import settings
+
+# Rows written between two progress updates
+PROGRESS_EVERY = 5000
+
+
+def write_csv(job, rows, total, filename):
+    """
+    Writes `rows` (the header first) to
+    MEDIA_ROOT/jobs/<job id>-<attempt>-<filename>, recording progress on
+    `job` as it goes. The file is named on the job before it is written,
+    so run_job() can remove it if writing fails.
+    """
+    name = f"jobs/{job.pk}-{job.attempt}-{filename}"
+    path = os.path.join(settings.MEDIA_ROOT, name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    job.set_progress(0, total)
+    job.result.name = name
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(next(rows))
+        written = 0
+        for row in rows:
+            writer.writerow(row)
+            written += 1
+            if written % PROGRESS_EVERY == 0:
+                job.set_progress(written)
+    job.set_progress(written)
+
+
+def export_voters(job):
+    """Exports the voters matching the job's filter form parameters."""
+    from voter_analytics.exports import voter_export_queryset, voter_export_rows
+    params = job.params
+    write_csv(job, voter_export_rows(params), voter_export_queryset(params).count(), 'voters.csv')
+
+
+def export_results(job):
+    """Exports the marathon results matching the job's search parameters."""
+    from marathon_analytics.exports import result_export_queryset, result_export_rows
+    params = job.params
+    write_csv(job, result_export_rows(params), result_export_queryset(params).count(), 'results.csv')
+
+
+# Job.kind -> (description, handler)
+HANDLERS = {
+    'voter_export': ("Voter CSV export", export_voters),
+    'result_export': ("Marathon results CSV export", export_results),
+}
+
+
+def discard_result(job):
+    """Deletes the output file of this run of `job`, if it wrote one."""
+    if job.result.name:
+        job.result.delete(save=False)
+
+
+def run_job(job):
+    """
+    Runs a claimed job with its handler and records the outcome on it.
+
+    A failed run's partial output is deleted, and so is the output of a
+    run whose job was requeued meanwhile, since the new run writes its own.
+    """
+    try:
+        description, handler = HANDLERS[job.kind]
+        handler(job)
+    except Exception as e:
+        discard_result(job)
+        job.finish(error=f"{type(e).__name__}: {e}")
+    else:
+        if not job.finish():
+            discard_result(job)
@@ -0,0 +1,46 @@
+# jobs/management/commands/run_jobs.py
+# Ting Shing Liu, 10/18/26
+# manage.py command that runs queued background jobs
+
+import time
+from django.core.management.base import BaseCommand
+from jobs.handlers import run_job
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (exports) until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once the queue is empty instead of waiting for more jobs.")
+        parser.add_argument('--poll', type=float, default=2.0,
+                            help="Seconds to wait between checks of an empty queue (default: 2).")
+        parser.add_argument('--stale-after', type=float, default=600.0,
+                            help="Requeue running jobs with no progress for this many seconds, "
+                                 "e.g. after a worker crashed (default: 600).")
+
+    def handle(self, *args, **options):
+        while True:
+            requeued = Job.requeue_stale(options['stale_after'])
+            if requeued:
+                self.stdout.write(self.style.WARNING(f"Requeued {requeued} stale running job(s)"))
+
+            job = Job.claim_next()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['poll'])
+                continue
+
+            self.stdout.write(f"Running {job}")
+            start = time.perf_counter()
+            run_job(job)
+            seconds = time.perf_counter() - start
+            if job.status == Job.DONE:
+                self.stdout.write(self.style.SUCCESS(
+                    f"Finished {job} in {seconds:.1f}s: {job.progress:,} rows, {job.result.name}"))
+            elif job.status == Job.FAILED:
+                self.stdout.write(self.style.ERROR(f"{job} failed: {job.error}"))
+            else:
+                self.stdout.write(self.style.WARNING(f"{job} was requeued while running, its output is discarded"))
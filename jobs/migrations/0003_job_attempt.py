@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='attempt',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,140 @@
+# jobs/models.py
+# Ting Shing Liu, 10/18/26
+# Background jobs queued by the web views and run by manage.py run_jobs
+
+from datetime import timedelta
+from django.db import models
+from django.db.models import F
+from django.utils import timezone
+
+
+class JobRequeued(Exception):
+    """Raised to a worker whose running job was requeued and claimed again."""
+
+
+class Job(models.Model):
+    """
+    One unit of background work, such as a CSV export.
+
+    Views create jobs in the 'queued' state; a worker process started
+    with `manage.py run_jobs` claims them one at a time, records its
+    progress on the row, and stores the output file in MEDIA_ROOT.
+
+    A running job's `heartbeat` is refreshed with every progress update.
+    If its worker dies, the job stays 'running' until requeue_stale()
+    (called by run_jobs before each claim) puts it back in the queue.
+
+    Every claim increments `attempt`, and a worker only writes to the row
+    while the attempt it claimed is current. A slow worker whose job was
+    requeued and claimed again can then no longer overwrite the new run.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    # which handler in jobs/handlers.py runs the job, and its arguments
+    kind = models.CharField(max_length=40)
+    params = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True, blank=True)
+    result = models.FileField(upload_to='jobs/', blank=True)
+    error = models.TextField(blank=True)
+
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, blank=True)
+    heartbeat = models.DateTimeField(null=True, blank=True)
+    attempt = models.PositiveIntegerField(default=0)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # the worker's "oldest queued job" lookup
+            models.Index(fields=['status', 'created'], name='job_status_created_idx'),
+        ]
+
+    def __str__(self):
+        """Return a string representation of this job."""
+        return f"{self.kind} job {self.pk} ({self.status})"
+
+    @classmethod
+    def claim_next(cls):
+        """
+        Marks the oldest queued job as running and returns it, or returns
+        None if the queue is empty.
+
+        The status is changed with a conditional UPDATE, so when several
+        workers race for the same job only one of them gets it.
+        """
+        for pk in cls.objects.filter(status=cls.QUEUED).order_by('created').values_list('pk', flat=True)[:10]:
+            now = timezone.now()
+            claimed = cls.objects.filter(pk=pk, status=cls.QUEUED).update(
+                status=cls.RUNNING, started=now, heartbeat=now, attempt=F('attempt') + 1)
+            if claimed:
+                return cls.objects.get(pk=pk)
+        return None
+
+    @classmethod
+    def requeue_stale(cls, timeout):
+        """
+        Puts running jobs whose heartbeat is more than `timeout` seconds
+        old back in the queue, so a job whose worker crashed is run
+        again. Returns the number of jobs requeued.
+        """
+        cutoff = timezone.now() - timedelta(seconds=timeout)
+        return cls.objects.filter(status=cls.RUNNING, heartbeat__lt=cutoff).update(
+            status=cls.QUEUED, progress=0, started=None, heartbeat=None)
+
+    def current_run(self):
+        """Returns a queryset of this job's row while this run of it is current."""
+        return Job.objects.filter(pk=self.pk, status=self.RUNNING, attempt=self.attempt)
+
+    def set_progress(self, progress, total=None):
+        """
+        Records how much of the job is done, and that its worker is still
+        alive, without touching other fields.
+
+        Raises JobRequeued if the job has been requeued since this run
+        claimed it.
+        """
+        self.progress = progress
+        self.heartbeat = timezone.now()
+        fields = {'progress': progress, 'heartbeat': self.heartbeat}
+        if total is not None:
+            self.total = fields['total'] = total
+        if not self.current_run().update(**fields):
+            raise JobRequeued(f"{self} was requeued")
+
+    def finish(self, error=''):
+        """
+        Marks the job done (or failed, if `error` is given) and stores its
+        result. Returns False, changing nothing, if the job has been
+        requeued since this run claimed it.
+        """
+        fields = {
+            'status': self.FAILED if error else self.DONE,
+            'error': error,
+            'result': self.result.name or '',
+            'finished': timezone.now(),
+        }
+        if not self.current_run().update(**fields):
+            return False
+        for name, value in fields.items():
+            setattr(self, name, value)
+        return True
+
+    def percent(self):
+        """Returns how far along the job is, from 0 to 100, or None if unknown."""
+        if self.status == self.DONE:
+            return 100
+        if not self.total:
+            return None
+        return min(100, 100 * self.progress // self.total)
@@ -0,0 +1,182 @@
+# jobs/tests.py
+# Ting Shing Liu, 10/18/26
+# Tests for the background jobs app
+
+import csv
+import io
+import os
+import tempfile
+from datetime import timedelta
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from .handlers import HANDLERS, run_job, write_csv
+from .models import Job, JobRequeued
+
+
+def count_to_three(job):
+    """A test handler that writes three numbered rows."""
+    write_csv(job, iter([['n'], [1], [2], [3]]), 3, 'numbers.csv')
+
+
+def fail(job):
+    """A test handler that always fails."""
+    raise RuntimeError("out of disk")
+
+
+def fail_halfway(job):
+    """A test handler that fails after writing two rows."""
+    def rows():
+        yield from [['n'], [1], [2]]
+        raise RuntimeError("out of disk")
+    write_csv(job, rows(), 3, 'numbers.csv')
+
+
+TEST_HANDLERS = {
+    'count': ("Counting", count_to_three),
+    'fail': ("Failing", fail),
+    'fail_halfway': ("Failing halfway", fail_halfway),
+}
+
+
+class JobTestCase(TestCase):
+    """Runs each test with the test handlers and a temporary MEDIA_ROOT."""
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        handlers = mock.patch.dict(HANDLERS, TEST_HANDLERS)
+        handlers.start()
+        self.addCleanup(handlers.stop)
+
+
+class JobModelTests(JobTestCase):
+
+    def test_claim_next_claims_each_job_once(self):
+        first = Job.objects.create(kind='count')
+        second = Job.objects.create(kind='count')
+        self.assertEqual(Job.claim_next().pk, first.pk)
+        self.assertEqual(Job.claim_next().pk, second.pk)
+        self.assertIsNone(Job.claim_next())
+        self.assertEqual(set(Job.objects.values_list('status', flat=True)), {Job.RUNNING})
+
+    def test_run_job_success(self):
+        Job.objects.create(kind='count')
+        job = Job.claim_next()
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.total, job.percent()), (Job.DONE, 3, 3, 100))
+        with job.result.open('r') as f:
+            self.assertEqual(list(csv.reader(f)), [['n'], ['1'], ['2'], ['3']])
+
+    def test_run_job_failure(self):
+        Job.objects.create(kind='fail')
+        job = Job.claim_next()
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.error, "RuntimeError: out of disk")
+        self.assertIsNotNone(job.finished)
+
+    def output_files(self):
+        """Returns the files written under MEDIA_ROOT/jobs."""
+        directory = os.path.join(self.media_root, 'jobs')
+        return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+    def test_failed_run_deletes_its_partial_output(self):
+        Job.objects.create(kind='fail_halfway')
+        job = Job.claim_next()
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error, job.progress), (Job.FAILED, "RuntimeError: out of disk", 0))
+        self.assertFalse(job.result)
+        self.assertEqual(self.output_files(), [])
+
+    def requeue_and_claim_again(self, job):
+        """Makes `job` look stale, requeues it and returns the new run's claim."""
+        Job.objects.filter(pk=job.pk).update(heartbeat=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(Job.requeue_stale(60), 1)
+        return Job.claim_next()
+
+    def test_requeued_run_cannot_overwrite_the_new_run(self):
+        Job.objects.create(kind='count')
+        old_run = Job.claim_next()
+        new_run = self.requeue_and_claim_again(old_run)
+        self.assertEqual((old_run.attempt, new_run.attempt), (1, 2))
+
+        with self.assertRaises(JobRequeued):
+            old_run.set_progress(10, 10)
+        self.assertFalse(old_run.finish(error="too slow"))
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.error, job.total), (Job.RUNNING, '', None))
+
+        run_job(new_run)
+        self.assertEqual(Job.objects.get().status, Job.DONE)
+        self.assertEqual(self.output_files(), [f'{job.pk}-2-numbers.csv'])
+
+    def test_requeued_run_discards_its_output(self):
+        Job.objects.create(kind='count')
+        job = Job.claim_next()
+        # finish() returns False when the job was requeued after the file was written
+        with mock.patch.object(Job, 'finish', return_value=False):
+            run_job(job)
+        self.assertEqual(self.output_files(), [])
+
+    def test_stale_running_jobs_are_requeued(self):
+        Job.objects.create(kind='count')
+        job = Job.claim_next()
+        self.assertEqual(Job.requeue_stale(60), 0)
+        Job.objects.filter(pk=job.pk).update(heartbeat=timezone.now() - timedelta(minutes=5))
+        self.assertEqual(Job.requeue_stale(60), 1)
+        self.assertEqual(Job.claim_next().pk, job.pk)
+
+    def test_run_jobs_command(self):
+        done = Job.objects.create(kind='count')
+        crashed = Job.objects.create(kind='count', status=Job.RUNNING,
+                                     heartbeat=timezone.now() - timedelta(hours=1))
+        call_command('run_jobs', once=True, stale_after=60, stdout=io.StringIO())
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses, {done.pk: Job.DONE, crashed.pk: Job.DONE})
+
+
+class JobViewTests(JobTestCase):
+
+    def test_create_redirects_browsers_to_the_job_page(self):
+        response = self.client.post(reverse('job_create', args=['count']) + '?party=D',
+                                    HTTP_ACCEPT='text/html')
+        job = Job.objects.get()
+        self.assertRedirects(response, reverse('job_detail', args=[job.pk]))
+        self.assertEqual(job.params, {'party': 'D'})
+
+    def test_create_returns_status_json_to_other_clients(self):
+        response = self.client.post(reverse('job_create', args=['count']), HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], Job.QUEUED)
+
+    def test_create_unknown_kind_is_404(self):
+        response = self.client.post(reverse('job_create', args=['nope']))
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Job.objects.exists())
+
+    def test_status_and_download(self):
+        job = Job.objects.create(kind='count')
+        status = self.client.get(reverse('job_status', args=[job.pk])).json()
+        self.assertEqual((status['status'], status['percent'], status['result_url']), (Job.QUEUED, None, None))
+
+        run_job(Job.claim_next())
+        status = self.client.get(reverse('job_status', args=[job.pk])).json()
+        self.assertEqual((status['status'], status['percent']), (Job.DONE, 100))
+        self.assertTrue(status['result_url'].endswith(f"jobs/{job.pk}-1-numbers.csv"))
+
+        page = self.client.get(reverse('job_detail', args=[job.pk]))
+        self.assertContains(page, "Counting")
+        self.assertContains(page, status['result_url'])
+
+    def test_status_of_unknown_job_is_404(self):
+        self.assertEqual(self.client.get(reverse('job_status', args=[999])).status_code, 404)
@@ -0,0 +1,12 @@
+# jobs/urls.py
+# Ting Shing Liu, 10/18/26
+# URL configuration for the jobs app
+
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('<str:kind>/start', views.JobCreateView.as_view(), name='job_create'), # queues a job, e.g. voter_export
+    path('<int:pk>', views.JobDetailView.as_view(), name='job_detail'), # progress page of one job
+    path('<int:pk>/status.json', views.JobStatusView.as_view(), name='job_status'), # polled by the progress page
+]
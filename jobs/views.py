@@ -0,0 +1,64 @@
+# jobs/views.py
+# Ting Shing Liu, 10/18/26
+# Views to queue background jobs and follow their progress
+
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.views import View
+from django.views.generic import DetailView
+from .handlers import HANDLERS
+from .models import Job
+
+
+def job_status(job):
+    """Returns the JSON-ready status of `job`."""
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': job.progress,
+        'total': job.total,
+        'percent': job.percent(),
+        'result_url': job.result.url if job.result else None,
+        'error': job.error,
+        'status_url': reverse('job_status', kwargs={'pk': job.pk}),
+        'page_url': reverse('job_detail', kwargs={'pk': job.pk}),
+    }
+
+
+class JobCreateView(View):
+    """
+    Queues a job of the kind in the URL, with the query string as its
+    parameters, and returns at once.
+
+    Browsers are redirected to the job's page; other clients get the
+    job's status as JSON with a 202 status code.
+    """
+
+    def post(self, request, kind):
+        if kind not in HANDLERS:
+            raise Http404(f"Unknown job kind {kind!r}.")
+        job = Job.objects.create(kind=kind, params=request.GET.dict())
+        if request.accepts('text/html'):
+            return redirect('job_detail', pk=job.pk)
+        return JsonResponse(job_status(job), status=202)
+
+
+class JobStatusView(View):
+    """Returns the status and progress of one job as JSON, for polling."""
+
+    def get(self, request, pk):
+        return JsonResponse(job_status(get_object_or_404(Job, pk=pk)))
+
+
+class JobDetailView(DetailView):
+    """A page that follows one job's progress and links to its result."""
+    model = Job
+    template_name = 'jobs/job_detail.html'
+    context_object_name = 'job'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['description'] = HANDLERS.get(self.object.kind, (self.object.kind,))[0]
+        return context
@@ -0,0 +1,31 @@
+# marathon_analytics/exports.py
+# CSV export of marathon results
+
+from .models import Result
+from .parsers import RESULT_COLUMNS, format_seconds
+from .search import result_filter
+
+# Rows read from the database per round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# Columns of the export: the race, then the columns of the results file
+EXPORT_COLUMNS = ['race'] + RESULT_COLUMNS
+
+# Result fields read for each exported row, in EXPORT_COLUMNS order
+EXPORT_FIELDS = EXPORT_COLUMNS[:14] + ['finish_seconds', 'half1_seconds', 'half2_seconds']
+
+
+def result_export_queryset(params):
+    '''Return the results matching the results page's search, by place.'''
+    results = Result.objects.filter(result_filter(params)).order_by('race', 'place_overall')
+    return results.values_list(*EXPORT_FIELDS)
+
+
+def result_export_rows(params):
+    '''
+    Yield the header and then one row per result matching `params`: the
+    race followed by the columns of the results file.
+    '''
+    yield EXPORT_COLUMNS
+    for values in result_export_queryset(params).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield list(values[:14]) + [format_seconds(seconds) for seconds in values[14:]]
@@ -0,0 +1,55 @@
+# marathon_analytics/loader.py
+# Bulk loading of marathon results into the Result table
+
+import time
+from django.db import transaction
+from cs412.ingest import RejectWriter, iter_rows
+from .models import Result, ResultGeneration
+from .parsers import RESULT_COLUMNS, parse_result_row
+from .passing import set_passing_counts
+
+# Number of rows sent to the database per INSERT
+BATCH_SIZE = 5000
+
+# The race of the results loaded before races were tracked
+DEFAULT_RACE = 'Chicago Marathon 2023'
+
+
+def load_results(filename, race=DEFAULT_RACE, batch_size=BATCH_SIZE, reject_filename=None, workers=1):
+    '''
+    Replace the results of `race` with the rows of `filename`, leaving
+    other races alone.
+
+    The runners passed/passed by counts are computed for the whole race
+    before inserting, then rows are inserted with bulk_create in batches
+    of `batch_size` inside a single transaction, which also bumps
+    ResultGeneration. Rejected rows are written to `reject_filename`
+    (default: `<filename>.rejects.csv`). With workers > 1 the file is
+    parsed in that many processes while this process does the writing.
+
+    Returns a dict with the number of rows loaded and rejected and the
+    elapsed time in seconds.
+    '''
+    if reject_filename is None:
+        reject_filename = f'{filename}.rejects.csv'
+    rejects = RejectWriter(reject_filename, RESULT_COLUMNS)
+
+    start = time.perf_counter()
+    try:
+        with transaction.atomic():
+            Result.objects.filter(race=race).delete()
+            results = [Result(race=race, **row)
+                       for row in iter_rows(filename, parse_result_row, rejects, workers)]
+            set_passing_counts(results)
+            Result.objects.bulk_create(results, batch_size=batch_size)
+            loaded = len(results)
+            ResultGeneration.bump()
+    finally:
+        rejects.close()
+
+    return {
+        'loaded': loaded,
+        'rejected': rejects.count,
+        'reject_filename': reject_filename if rejects.count else None,
+        'seconds': time.perf_counter() - start,
+    }
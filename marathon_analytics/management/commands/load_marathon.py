@@ -0,0 +1,44 @@
+# marathon_analytics/management/commands/load_marathon.py
+# manage.py command to bulk load one race's results file
+
+from django.core.management.base import BaseCommand, CommandError
+from marathon_analytics.loader import BATCH_SIZE, DEFAULT_RACE, load_results
+
+
+class Command(BaseCommand):
+    help = "Load a marathon results CSV file, replacing the results of its race."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to the results CSV file")
+        parser.add_argument('--race', default=DEFAULT_RACE,
+                            help=f"Name of the race the results belong to (default {DEFAULT_RACE!r})")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f"Rows per INSERT (default {BATCH_SIZE})")
+        parser.add_argument('--rejects', metavar='PATH',
+                            help="Where to write rejected rows (default <path>.rejects.csv)")
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Number of processes used to parse the file (default 1)")
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1")
+        if not options['race'].strip():
+            raise CommandError("--race must not be empty")
+        try:
+            stats = load_results(options['path'],
+                                 race=options['race'].strip(),
+                                 batch_size=options['batch_size'],
+                                 reject_filename=options['rejects'],
+                                 workers=options['workers'])
+        except OSError as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+
+        rate = stats['loaded'] / stats['seconds'] if stats['seconds'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {stats['loaded']} results for {options['race'].strip()} "
+            f"in {stats['seconds']:.2f}s ({rate:,.0f} rows/s)."
+        ))
+        if stats['rejected']:
+            self.stdout.write(self.style.WARNING(
+                f"Rejected {stats['rejected']} rows, see {stats['reject_filename']}"
+            ))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:55
+
+from django.db import migrations, models
+from marathon_analytics.passing import passing_counts
+
+
+def fill_passing_counts(apps, schema_editor):
+    '''Computes runners_passed and runners_passed_by for the results already loaded.'''
+    Result = apps.get_model('marathon_analytics', 'Result')
+    results = list(Result.objects.only('start_time_of_day', 'finish_time_of_day'))
+    passed, passed_by = passing_counts([(r.start_time_of_day, r.finish_time_of_day) for r in results])
+    for r, count, count_by in zip(results, passed, passed_by):
+        r.runners_passed = count
+        r.runners_passed_by = count_by
+    Result.objects.bulk_update(results, ['runners_passed', 'runners_passed_by'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marathon_analytics', '0002_resultgeneration'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='runners_passed',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='runners_passed_by',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_passing_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marathon_analytics', '0003_result_runners_passed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='race',
+            field=models.CharField(default='Chicago Marathon 2023', max_length=100),
+            preserve_default=False,
+        ),
+    ]
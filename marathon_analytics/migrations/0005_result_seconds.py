@@ -0,0 +1,106 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:30
+
+from datetime import time
+from django.db import migrations, models
+
+# (TimeField being replaced, the integer-seconds field replacing it)
+DURATIONS = [
+    ('time_finish', 'finish_seconds'),
+    ('time_half1', 'half1_seconds'),
+    ('time_half2', 'half2_seconds'),
+]
+
+
+def times_to_seconds(apps, schema_editor):
+    '''Converts the chip times already loaded into seconds.'''
+    Result = apps.get_model('marathon_analytics', 'Result')
+    results = list(Result.objects.only(*(name for name, seconds_name in DURATIONS)))
+    for r in results:
+        for name, seconds_name in DURATIONS:
+            value = getattr(r, name)
+            setattr(r, seconds_name, (value.hour * 60 + value.minute) * 60 + value.second)
+    Result.objects.bulk_update(results, [seconds_name for name, seconds_name in DURATIONS], batch_size=500)
+
+
+def seconds_to_times(apps, schema_editor):
+    '''Converts seconds back into times of day (times over 24 hours wrap around).'''
+    Result = apps.get_model('marathon_analytics', 'Result')
+    results = list(Result.objects.only(*(seconds_name for name, seconds_name in DURATIONS)))
+    for r in results:
+        for name, seconds_name in DURATIONS:
+            minutes, seconds = divmod(getattr(r, seconds_name), 60)
+            hours, minutes = divmod(minutes, 60)
+            setattr(r, name, time(hours % 24, minutes, seconds))
+    Result.objects.bulk_update(results, [name for name, seconds_name in DURATIONS], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marathon_analytics', '0004_result_race'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='result',
+            name='finish_seconds',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='half1_seconds',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='result',
+            name='half2_seconds',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='time_finish',
+            field=models.TimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='time_half1',
+            field=models.TimeField(null=True),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='time_half2',
+            field=models.TimeField(null=True),
+        ),
+        migrations.RunPython(times_to_seconds, seconds_to_times),
+        migrations.RemoveField(
+            model_name='result',
+            name='time_finish',
+        ),
+        migrations.RemoveField(
+            model_name='result',
+            name='time_half1',
+        ),
+        migrations.RemoveField(
+            model_name='result',
+            name='time_half2',
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='finish_seconds',
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='half1_seconds',
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='half2_seconds',
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['race', 'finish_seconds'], name='result_race_finish_idx'),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marathon_analytics', '0005_result_seconds'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='result',
+            name='first_name',
+            field=models.TextField(db_collation='NOCASE'),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='last_name',
+            field=models.TextField(db_collation='NOCASE'),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='ctz',
+            field=models.TextField(db_collation='NOCASE'),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='city',
+            field=models.TextField(db_collation='NOCASE'),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='state',
+            field=models.TextField(db_collation='NOCASE'),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='gender',
+            field=models.CharField(db_collation='NOCASE', max_length=6),
+        ),
+        migrations.AlterField(
+            model_name='result',
+            name='division',
+            field=models.CharField(db_collation='NOCASE', max_length=6),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['race', 'place_overall'], name='result_race_place_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['bib', 'race'], name='result_bib_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['last_name', 'first_name', 'race'], name='result_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['city', 'race'], name='result_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['state', 'race'], name='result_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['ctz', 'race'], name='result_ctz_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['gender', 'race', 'place_overall'], name='result_gender_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['division', 'gender', 'race', 'place_overall'], name='result_division_idx'),
+        ),
+    ]
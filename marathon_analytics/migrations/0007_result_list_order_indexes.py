@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marathon_analytics', '0006_result_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_bib_idx',
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['bib', 'race', 'place_overall'], name='result_bib_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_city_idx',
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['city', 'race', 'place_overall'], name='result_city_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_state_idx',
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['state', 'race', 'place_overall'], name='result_state_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_ctz_idx',
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['ctz', 'race', 'place_overall'], name='result_ctz_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='result',
+            name='result_division_idx',
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['division', 'race', 'place_overall'], name='result_division_idx'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from cs412.generations import LoadGeneration
+from .parsers import format_seconds
 
 # Create your models here.
 class Result(models.Model):
@@ -7,17 +9,21 @@ class Result(models.Model):
     BIB,First Name,Last Name,CTZ,City,State,Gender,Division,
     Place Overall,Place Gender,Place Division,Start TOD,Finish TOD,Finish,HALF1,HALF2
     '''
+    # the race this result belongs to; each race is loaded separately
+    race = models.CharField(max_length=100)
+
     # identification
+    # (searched text is compared with SQLite's NOCASE collation, see search.py)
     bib = models.IntegerField()
-    first_name = models.TextField()
-    last_name = models.TextField()
-    ctz = models.TextField()
-    city = models.TextField()
-    state = models.TextField()
+    first_name = models.TextField(db_collation='NOCASE')
+    last_name = models.TextField(db_collation='NOCASE')
+    ctz = models.TextField(db_collation='NOCASE')
+    city = models.TextField(db_collation='NOCASE')
+    state = models.TextField(db_collation='NOCASE')
  
     # gender/division
-    gender = models.CharField(max_length=6)
-    division = models.CharField(max_length=6)
+    gender = models.CharField(max_length=6, db_collation='NOCASE')
+    division = models.CharField(max_length=6, db_collation='NOCASE')
  
     # result place
     place_overall = models.IntegerField()
@@ -28,70 +34,58 @@ class Result(models.Model):
     start_time_of_day = models.TimeField()
     finish_time_of_day = models.TimeField()
  
-    time_finish = models.TimeField()
-    time_half1 = models.TimeField()
-    time_half2 = models.TimeField()
+    # chip times in whole seconds (may exceed 24 hours)
+    finish_seconds = models.PositiveIntegerField()
+    half1_seconds = models.PositiveIntegerField()
+    half2_seconds = models.PositiveIntegerField()
+
+    # precomputed by the loader (see passing.py)
+    runners_passed = models.IntegerField(default=0)
+    runners_passed_by = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # finish time order and time ranges within a race
+            models.Index(fields=['race', 'finish_seconds'], name='result_race_finish_idx'),
+            # the results list of a race, by place
+            models.Index(fields=['race', 'place_overall'], name='result_race_place_idx'),
+            # one index per search form field (see search.py), followed by
+            # the results list's order (race, place_overall) so a filtered
+            # list is read in order without sorting; race also keeps the
+            # lookups and autocomplete within one race
+            models.Index(fields=['bib', 'race', 'place_overall'], name='result_bib_idx'),
+            models.Index(fields=['last_name', 'first_name', 'race'], name='result_name_idx'),
+            models.Index(fields=['city', 'race', 'place_overall'], name='result_city_idx'),
+            models.Index(fields=['state', 'race', 'place_overall'], name='result_state_idx'),
+            models.Index(fields=['ctz', 'race', 'place_overall'], name='result_ctz_idx'),
+            models.Index(fields=['gender', 'race', 'place_overall'], name='result_gender_idx'),
+            models.Index(fields=['division', 'race', 'place_overall'], name='result_division_idx'),
+        ]
  
     def __str__(self):
         '''Return a string representation of this model instance.'''
-        return f'{self.first_name} {self.last_name} ({self.city}, {self.state}), {self.time_finish}'
+        return f'{self.first_name} {self.last_name} ({self.city}, {self.state}), {format_seconds(self.finish_seconds)}'
     
     def get_runners_passed(self):
         '''Return the number of runners passed by this runner.'''
-        started_first = Result.objects.filter(start_time_of_day__lt=self.start_time_of_day)
-        passed = started_first.filter(finish_time_of_day__gt=self.finish_time_of_day)
- 
-        return len(passed)
+        return self.runners_passed
         
     def get_runners_passed_by(self):
         '''Return the number of runners who passed this runner.'''
-        started_later = Result.objects.filter(start_time_of_day__gt=self.start_time_of_day)
-        passed_by = started_later.filter(finish_time_of_day__lt=self.finish_time_of_day)
- 
-        return len(passed_by)
+        return self.runners_passed_by
  
-def load_data():
-    '''Function to load data records from CSV file into Django model instances.'''
-	
-    Result.objects.all().delete()
+class ResultGeneration(LoadGeneration):
+    '''Bumped by the loader every time the Result table changes.'''
 
-    filename = r"\Users\victo\Downloads\2023_chicago_results.csv"
-    f = open(filename)
-    f.readline() # discard headers
- 
- 
-    for line in f:
-        fields = line.split(',')
-       
-        try:
-            # create a new instance of Result object with this record from CSV
-            result = Result(bib=fields[0],
-                            first_name=fields[1],
-                            last_name=fields[2],
-                            ctz = fields[3],
-                            city = fields[4],
-                            state = fields[5],
-                            
-                            gender = fields[6],
-                            division = fields[7],
- 
-                            place_overall = fields[8],
-                            place_gender = fields[9],
-                            place_division = fields[10],
-                        
-                            start_time_of_day = fields[11],
-                            finish_time_of_day = fields[12],
-                            time_finish = fields[13],
-                            time_half1 = fields[14],
-                            time_half2 = fields[15],
-                        )
-        
- 
- 
-            result.save() # commit to database
-            print(f'Created result: {result}')
-            
-        except:
-            print(f"Skipped: {fields}")
-    
-    print(f'Done. Created {len(Result.objects.all())} Results.')
+
+def load_data(filename, workers=1, race=None):
+    '''
+    Function to load data records from CSV file into Django model instances.
+
+    Kept for use from the Django shell; see marathon_analytics.loader and
+    the `load_marathon` management command.
+    '''
+    from .loader import DEFAULT_RACE, load_results
+
+    stats = load_results(filename, race=race or DEFAULT_RACE, workers=workers)
+    print(f"Done. Created {stats['loaded']} Results, skipped {stats['rejected']}.")
@@ -0,0 +1,76 @@
+# marathon_analytics/parsers.py
+# Parsing and validation of rows from the marathon results file
+
+from datetime import time
+
+# Column order of the results file
+RESULT_COLUMNS = [
+    'bib', 'first_name', 'last_name', 'ctz', 'city', 'state', 'gender', 'division',
+    'place_overall', 'place_gender', 'place_division',
+    'start_time_of_day', 'finish_time_of_day', 'time_finish', 'time_half1', 'time_half2',
+]
+
+
+def parse_time(text):
+    '''Parse an H:MM:SS or HH:MM:SS field into a datetime.time.'''
+    hours, minutes, seconds = text.strip().split(':')
+    return time(int(hours), int(minutes), int(seconds))
+
+
+def parse_seconds(text):
+    '''
+    Parse an H:MM:SS or MM:SS duration into a number of seconds. Unlike
+    parse_time(), the hours may go past 23.
+
+    Raises ValueError for blank or malformed durations.
+    '''
+    parts = text.strip().split(':')
+    if len(parts) == 2:
+        parts.insert(0, '0')
+    try:
+        hours, minutes, seconds = (int(part) for part in parts)
+    except ValueError:
+        raise ValueError(f'invalid duration {text!r}') from None
+    if hours < 0 or not 0 <= minutes < 60 or not 0 <= seconds < 60:
+        raise ValueError(f'invalid duration {text!r}')
+    return (hours * 60 + minutes) * 60 + seconds
+
+
+def format_seconds(seconds):
+    '''Format a number of seconds as HH:MM:SS, the inverse of parse_seconds().'''
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
+
+
+def parse_result_row(fields):
+    '''
+    Convert one row of the results file (a list of strings) into a dict
+    of Result field values.
+
+    Raises ValueError if the row is malformed.
+    '''
+    if len(fields) != len(RESULT_COLUMNS):
+        raise ValueError(f'expected {len(RESULT_COLUMNS)} columns, got {len(fields)}')
+
+    return {
+        'bib': int(fields[0]),
+        'first_name': fields[1],
+        'last_name': fields[2],
+        'ctz': fields[3],
+        'city': fields[4],
+        'state': fields[5],
+
+        'gender': fields[6],
+        'division': fields[7],
+
+        'place_overall': int(fields[8]),
+        'place_gender': int(fields[9]),
+        'place_division': int(fields[10]),
+
+        'start_time_of_day': parse_time(fields[11]),
+        'finish_time_of_day': parse_time(fields[12]),
+        'finish_seconds': parse_seconds(fields[13]),
+        'half1_seconds': parse_seconds(fields[14]),
+        'half2_seconds': parse_seconds(fields[15]),
+    }
@@ -0,0 +1,83 @@
+# marathon_analytics/passing.py
+# Counts of runners passed and passed by, for every result at once
+
+from bisect import bisect_left
+
+
+class FenwickTree:
+    '''Counts of items by rank 0..size-1, with O(log n) updates and prefix sums.'''
+
+    def __init__(self, size):
+        self.tree = [0] * (size + 1)
+
+    def add(self, rank, count=1):
+        '''Add `count` items of rank `rank`.'''
+        i = rank + 1
+        while i < len(self.tree):
+            self.tree[i] += count
+            i += i & -i
+
+    def count_below(self, rank):
+        '''Return the number of items with a rank lower than `rank`.'''
+        total = 0
+        i = rank
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+def passing_counts(times):
+    '''
+    For a list of (start, finish) pairs, return two lists with, for each
+    runner, the number of runners they passed (started earlier, finished
+    later) and the number who passed them (started later, finished
+    earlier). Ties in either time count as neither.
+
+    Runners are swept in start order while a Fenwick tree over finish
+    time ranks counts the runners already seen, so this takes
+    O(n log n) instead of one O(n) query per runner.
+    '''
+    finishes = sorted({finish for start, finish in times})
+    ranks = [bisect_left(finishes, finish) for start, finish in times]
+    order = sorted(range(len(times)), key=lambda i: times[i][0])
+
+    passed = [0] * len(times)
+    passed_by = [0] * len(times)
+
+    # earliest starters first: count those who started earlier and finished later
+    seen = FenwickTree(len(finishes))
+    for group in start_groups(order, times):
+        for i in group:
+            passed[i] = seen.count_below(len(finishes)) - seen.count_below(ranks[i] + 1)
+        for i in group:
+            seen.add(ranks[i])
+
+    # latest starters first: count those who started later and finished earlier
+    seen = FenwickTree(len(finishes))
+    for group in reversed(start_groups(order, times)):
+        for i in group:
+            passed_by[i] = seen.count_below(ranks[i])
+        for i in group:
+            seen.add(ranks[i])
+
+    return passed, passed_by
+
+
+def start_groups(order, times):
+    '''Split indexes sorted by start time into lists of runners with the same start.'''
+    groups = []
+    for i in order:
+        if groups and times[groups[-1][0]][0] == times[i][0]:
+            groups[-1].append(i)
+        else:
+            groups.append([i])
+    return groups
+
+
+def set_passing_counts(results):
+    '''Set runners_passed and runners_passed_by on a list of Result objects.'''
+    passed, passed_by = passing_counts([(r.start_time_of_day, r.finish_time_of_day) for r in results])
+    for r, count, count_by in zip(results, passed, passed_by):
+        r.runners_passed = count
+        r.runners_passed_by = count_by
@@ -0,0 +1,90 @@
+# marathon_analytics/percentiles.py
+# Percentile and would-be place of a finish time, from sorted finish times in memory
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from .models import Result, ResultGeneration
+from .search import normalize_gender
+
+# Seconds between two checks of ResultGeneration; in between, lookups
+# use the finish times in memory without touching the database
+GENERATION_CHECK_SECONDS = 30
+
+
+def normalize_cohort(gender=None, division=None):
+    '''
+    Return (gender, division) as stored in the results file, either may
+    be None. A division written with its gender letter, like 'F35-39',
+    is split into the two.
+    '''
+    gender = normalize_gender(gender)
+    division = (division or '').strip().upper() or None
+    if division and division[0] in 'FM' and division[1:2].isdigit():
+        gender = gender or normalize_gender(division[0])
+        division = division[1:]
+    return gender, division
+
+
+class FinishTimes:
+    '''
+    Sorted lists of finish seconds for every cohort of one load
+    generation of the Result table. A cohort is a (race, gender,
+    division) key where any part may be None, meaning "all".
+    '''
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.cohorts = {}
+        rows = Result.objects.order_by('finish_seconds').values_list(
+            'race', 'gender', 'division', 'finish_seconds')
+        for race, gender, division, seconds in rows.iterator(chunk_size=10000):
+            # rows arrive in finish order, so every list is already sorted
+            for key in self.keys(race, gender, division):
+                self.cohorts.setdefault(key, []).append(seconds)
+
+    @staticmethod
+    def keys(race, gender, division):
+        '''Return the cohort keys a result with these values belongs to.'''
+        return [(r, g, d) for r in (race, None) for g in (gender, None) for d in (division, None)]
+
+    def lookup(self, seconds, race=None, gender=None, division=None):
+        '''
+        Return the place a finish of `seconds` would have taken in the
+        cohort, and the percentage of the cohort it beats, or None if no
+        one in the cohort finished.
+        '''
+        times = self.cohorts.get((race or None, gender, division))
+        if not times:
+            return None
+        faster = bisect_left(times, seconds)
+        slower = len(times) - bisect_right(times, seconds)
+        return {
+            'runners': len(times),
+            'place': faster + 1,
+            'percentile': round(100 * slower / len(times), 1),
+        }
+
+
+_finish_times = None
+_checked_at = None
+_finish_times_lock = threading.Lock()
+
+
+def get_finish_times():
+    '''
+    Return the FinishTimes of the current ResultGeneration, checking the
+    generation at most every GENERATION_CHECK_SECONDS and rebuilding the
+    lists once after every load.
+    '''
+    global _finish_times, _checked_at
+    finish_times = _finish_times
+    if finish_times is not None and time.monotonic() - _checked_at < GENERATION_CHECK_SECONDS:
+        return finish_times
+    with _finish_times_lock:
+        if _finish_times is None or time.monotonic() - _checked_at >= GENERATION_CHECK_SECONDS:
+            generation = ResultGeneration.current()
+            if _finish_times is None or _finish_times.generation != generation:
+                _finish_times = FinishTimes(generation)
+            _checked_at = time.monotonic()
+        return _finish_times
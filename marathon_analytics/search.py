@@ -0,0 +1,128 @@
+# marathon_analytics/search.py
+# Translates the results search form into a database query
+#
+# The text columns searched here use SQLite's NOCASE collation (see the
+# Result model), so `=` is case-insensitive and still an index lookup,
+# and name prefixes become LIKE range scans of the name index.
+
+from django.db.models import Q
+from cs412.generations import cache_key, get_or_compute
+from .models import Result, ResultGeneration
+
+# GET parameters understood by the search form, in form order
+SEARCH_PARAMS = ['race', 'name', 'bib', 'city', 'state', 'ctz', 'gender', 'division']
+
+# Parameters matched exactly against the column of the same name
+EXACT_PARAMS = ['race', 'city', 'state', 'ctz', 'division']
+
+# Single-letter gender codes and the values stored in the results file
+GENDERS = {'F': 'Female', 'M': 'Male'}
+
+# Number of suggestions returned by autocomplete()
+AUTOCOMPLETE_LIMIT = 10
+
+
+def normalize_gender(value):
+    '''Return 'Female' or 'Male' for a gender code or name, or None.'''
+    value = (value or '').strip()
+    return GENDERS.get(value[:1].upper()) if value else None
+
+
+def normalize_search(params):
+    '''
+    Read the search form's GET parameters into a dict holding only the
+    filters in use: 'bib' (int), 'name' (a list of one or two words),
+    'gender' ('Female' or 'Male') and the EXACT_PARAMS (str).
+
+    Empty or malformed values are dropped.
+    '''
+    filters = {}
+
+    for name in EXACT_PARAMS:
+        value = (params.get(name) or '').strip()
+        if value:
+            filters[name] = value
+
+    try:
+        filters['bib'] = int(params.get('bib'))
+    except (TypeError, ValueError):
+        pass
+
+    words = (params.get('name') or '').split()
+    if words:
+        # "first last" or just a last name; any middle words are ignored
+        filters['name'] = [words[0], words[-1]] if len(words) > 1 else words
+
+    gender = normalize_gender(params.get('gender'))
+    if gender:
+        filters['gender'] = gender
+
+    return filters
+
+
+def race_options(generation=None):
+    '''
+    Return the races that can be chosen in the search form, cached until
+    the next load (`generation` defaults to the current ResultGeneration).
+    '''
+    if generation is None:
+        generation = ResultGeneration.current()
+    return get_or_compute(cache_key('result_race_options', generation),
+                          lambda: list(Result.objects.values_list('race', flat=True).distinct().order_by('race')))
+
+
+def search_signature(params):
+    '''
+    Return a canonical string for the filters in `params`, so requests
+    asking for the same results share cache entries.
+    '''
+    filters = normalize_search(params)
+    return '&'.join(f"{name}={filters[name]}" for name in sorted(filters))
+
+
+def name_filter(words):
+    '''
+    Return a Q matching a last name prefix, or for two words a first name
+    prefix and a last name prefix, both answered from result_name_idx.
+    '''
+    if len(words) == 1:
+        return Q(last_name__istartswith=words[0])
+    return Q(first_name__istartswith=words[0], last_name__istartswith=words[1])
+
+
+def result_filter(params):
+    '''Build a Q object from the search form's GET parameters.'''
+    filters = normalize_search(params)
+    q = Q()
+
+    for name in EXACT_PARAMS + ['bib', 'gender']:
+        if name in filters:
+            q &= Q(**{name: filters[name]})
+
+    if 'name' in filters:
+        q &= name_filter(filters['name'])
+
+    return q
+
+
+def autocomplete(field, prefix, race=None):
+    '''
+    Return up to AUTOCOMPLETE_LIMIT distinct names ("First Last") or
+    cities starting with `prefix`, in alphabetical order. Both are read
+    from a covering index, so no result rows are visited.
+    '''
+    words = prefix.split()
+    if not words or field not in ('name', 'city'):
+        return []
+
+    results = Result.objects.all()
+    if race:
+        results = results.filter(race=race)
+
+    if field == 'city':
+        cities = results.filter(city__istartswith=prefix.strip())
+        return list(cities.values_list('city', flat=True).distinct().order_by('city')[:AUTOCOMPLETE_LIMIT])
+
+    names = results.filter(name_filter([words[0], words[-1]] if len(words) > 1 else words))
+    names = names.values_list('first_name', 'last_name').distinct().order_by('last_name', 'first_name')
+    return [f"{first} {last}" for first, last in names[:AUTOCOMPLETE_LIMIT]]
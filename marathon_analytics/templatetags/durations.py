@@ -0,0 +1,15 @@
+# marathon_analytics/templatetags/durations.py
+# Template filter to display chip times stored in seconds
+
+from django import template
+from ..parsers import format_seconds
+
+register = template.Library()
+
+
+@register.filter
+def duration(seconds):
+    '''Display a number of seconds as HH:MM:SS, e.g. {{ r.finish_seconds|duration }}.'''
+    if seconds is None or seconds == '':
+        return ''
+    return format_seconds(int(seconds))
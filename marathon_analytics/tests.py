@@ -1,3 +1,354 @@
-from django.test import TestCase
+import io
+import itertools
+import os
+import random
+import tempfile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from .models import Result, ResultGeneration
+from . import percentiles
+from .exports import result_export_rows
+from .loader import load_results
+from .passing import passing_counts
+from .parsers import RESULT_COLUMNS, format_seconds, parse_seconds
+from .percentiles import FinishTimes, normalize_cohort
+from .search import SEARCH_PARAMS, autocomplete, result_filter
+from .views import ResultsListView
 
-# Create your tests here.
+# A sample value for every parameter of the search form
+SAMPLE_SEARCH_VALUES = {
+    'race': 'Chicago Marathon 2023',
+    'name': 'Kim',
+    'bib': '664',
+    'city': 'Denver',
+    'state': 'TX',
+    'ctz': 'USA',
+    'gender': 'F',
+    'division': '30-34',
+}
+
+
+class ResultIndexUsageTests(TestCase):
+    '''
+    Run EXPLAIN QUERY PLAN for the results page's query with no search and
+    with each combination of search fields, and check that none of them
+    scans the table. Unless a name is searched, the rows must also come
+    out of an index in the page's order, without a sort.
+    '''
+
+    def results_page(self, params):
+        '''Return the results page's queryset for the search in `params`.'''
+        view = ResultsListView(request=RequestFactory().get('/', params))
+        return view.get_queryset()
+
+    def assert_uses_index(self, queryset, sorted_by_index=True):
+        plan = queryset.explain()
+        for line in plan.splitlines():
+            if f'SCAN {Result._meta.db_table}' in line:
+                self.fail(f'full scan in plan:\n{plan}\n{queryset.query}')
+            if sorted_by_index and 'USE TEMP B-TREE' in line:
+                self.fail(f'sort in plan:\n{plan}\n{queryset.query}')
+
+    def test_unfiltered_list_uses_an_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('query plan checks are written for SQLite')
+        # a page walks result_race_place_idx in order and stops after 50 rows
+        page = self.results_page({})[:ResultsListView.paginate_by]
+        plan = page.explain()
+        self.assertIn('USING INDEX result_race_place_idx', plan)
+        self.assertNotIn('USE TEMP B-TREE', plan)
+
+    def test_every_search_combination_uses_an_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('query plan checks are written for SQLite')
+        for size in range(1, len(SEARCH_PARAMS) + 1):
+            for combination in itertools.combinations(SEARCH_PARAMS, size):
+                params = {name: SAMPLE_SEARCH_VALUES[name] for name in combination}
+                with self.subTest(search=combination):
+                    # a name prefix is a range of the name index, which can
+                    # not also be in place order; the few matches are sorted
+                    self.assert_uses_index(self.results_page(params), sorted_by_index='name' not in combination)
+
+    def test_two_word_names_use_an_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('query plan checks are written for SQLite')
+        self.assert_uses_index(self.results_page({'name': 'Cara Kim'}), sorted_by_index=False)
+
+
+class ResultSearchTests(TestCase):
+    '''Check that searches and suggestions ignore case, as the NOCASE columns promise.'''
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.result = Result.objects.create(
+            race='Chicago Marathon 2023', bib=664, first_name='Cara', last_name='Kim13',
+            ctz='USA', city='Denver', state='TX', gender='Female', division='30-34',
+            place_overall=1, place_gender=1, place_division=1,
+            start_time_of_day='07:30:00', finish_time_of_day='10:45:10',
+            finish_seconds=11710, half1_seconds=5800, half2_seconds=5910)
+
+    def test_search_ignores_case(self):
+        params = {'name': 'cara kim', 'city': 'DENVER', 'state': 'tx', 'ctz': 'usa',
+                  'gender': 'f', 'division': '30-34', 'bib': '664'}
+        self.assertEqual(list(Result.objects.filter(result_filter(params))), [self.result])
+        self.assertFalse(Result.objects.filter(result_filter({'name': 'cara jones'})).exists())
+
+    def test_autocomplete(self):
+        self.assertEqual(autocomplete('name', 'kim'), ['Cara Kim13'])
+        self.assertEqual(autocomplete('name', 'ca ki'), ['Cara Kim13'])
+        self.assertEqual(autocomplete('city', 'den'), ['Denver'])
+        self.assertEqual(autocomplete('city', 'den', race='Boston 2024'), [])
+
+
+class ResultChartDataViewTests(TestCase):
+    '''Fetch result/<pk>/charts.json and check its payload, ETag and invalidation by ResultGeneration.'''
+
+    def setUp(self):
+        # generations restart in every test, so drop responses cached by other tests
+        cache.clear()
+        self.result = Result.objects.create(
+            race='Chicago Marathon 2023', bib=664, first_name='Cara', last_name='Kim13',
+            ctz='USA', city='Denver', state='TX', gender='Female', division='30-34',
+            place_overall=1, place_gender=1, place_division=1,
+            start_time_of_day='07:30:00', finish_time_of_day='10:45:10',
+            finish_seconds=11710, half1_seconds=5800, half2_seconds=5910,
+            runners_passed=12, runners_passed_by=3)
+        self.url = reverse('result_charts', args=[self.result.pk])
+
+    def test_payload(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['splits'], {'labels': ['first half', 'second half'], 'values': [5800, 5910]})
+        self.assertEqual(data['passed']['values'], [12, 3])
+        self.assertEqual(self.client.get(reverse('result_charts', args=[self.result.pk + 1])).status_code, 404)
+
+    def test_etag_and_not_modified(self):
+        first = self.client.get(self.url)
+        self.assertTrue(first['ETag'])
+        self.assertIn('max-age=300', first['Cache-Control'])
+        again = self.client.get(self.url, headers={'if-none-match': first['ETag']})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+        self.assertEqual(again['ETag'], first['ETag'])
+
+    def test_new_generation_invalidates(self):
+        first = self.client.get(self.url)
+        Result.objects.filter(pk=self.result.pk).update(runners_passed=20)
+        # until the generation moves on, the cached data is served
+        self.assertEqual(self.client.get(self.url).json(), first.json())
+
+        ResultGeneration.bump()
+        second = self.client.get(self.url, headers={'if-none-match': first['ETag']})
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second.json()['passed']['values'], [20, 3])
+
+
+class DurationTests(TestCase):
+    '''Check parsing and formatting of durations stored as seconds.'''
+
+    def test_parse_seconds(self):
+        for text, seconds in [('2:05:00', 7500), ('02:05:00', 7500), (' 3:59:59 ', 14399),
+                              ('26:03:10', 93790), ('0:00:00', 0), ('59:30', 3570), ('05:07', 307)]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_seconds(text), seconds)
+
+    def test_parse_seconds_rejects_bad_durations(self):
+        for text in ['', '   ', '3:75:00', '3:00:60', '60:00', '-1:00:00', '3', '1:2:3:4', 'x:00:00']:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                parse_seconds(text)
+
+    def test_format_seconds(self):
+        self.assertEqual(format_seconds(7500), '02:05:00')
+        self.assertEqual(format_seconds(93790), '26:03:10')
+        for seconds in [0, 59, 3570, 14399, 93790]:
+            self.assertEqual(parse_seconds(format_seconds(seconds)), seconds)
+
+    def test_duration_filter(self):
+        template = Template('{% load durations %}[{{ value|duration }}]')
+        for value, shown in [(7500, '02:05:00'), (93790, '26:03:10'), ('307', '00:05:07'), (None, ''), ('', '')]:
+            with self.subTest(value=value):
+                self.assertEqual(template.render(Context({'value': value})), f'[{shown}]')
+
+
+class SecondsMigrationTests(TransactionTestCase):
+    '''Check that migration 0005 converts the chip times already loaded into seconds.'''
+
+    migrate_from = [('marathon_analytics', '0004_result_race')]
+    migrate_to = [('marathon_analytics', '0005_result_seconds')]
+
+    def migrate(self, targets):
+        '''Migrate to `targets` and return the historical apps at that point.'''
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        self.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_times_are_backfilled_as_seconds(self):
+        Result = self.migrate(self.migrate_from).get_model('marathon_analytics', 'Result')
+        Result.objects.create(
+            bib=664, first_name='Cara', last_name='Kim13', ctz='USA', city='Denver', state='TX',
+            gender='Female', division='30-34', place_overall=1, place_gender=1, place_division=1,
+            start_time_of_day='07:36:55', finish_time_of_day='09:41:55',
+            time_finish='02:05:00', time_half1='00:56:47', time_half2='01:08:13')
+
+        Result = self.migrate(self.migrate_to).get_model('marathon_analytics', 'Result')
+        self.assertEqual(list(Result.objects.values_list('finish_seconds', 'half1_seconds', 'half2_seconds')),
+                         [(7500, 3407, 4093)])
+
+
+class FinishTimesTests(TestCase):
+    '''Check percentile lookups against a small race.'''
+
+    @classmethod
+    def setUpTestData(cls):
+        for place, (gender, division, seconds) in enumerate([
+                ('Female', '35-39', 12000), ('Male', '35-39', 13000),
+                ('Female', '35-39', 13500), ('Female', '40-44', 14000),
+                ('Female', '35-39', 15000)], start=1):
+            Result.objects.create(
+                race='Chicago Marathon 2023', bib=place, first_name='A', last_name='B',
+                ctz='USA', city='Chicago', state='IL', gender=gender, division=division,
+                place_overall=place, place_gender=place, place_division=place,
+                start_time_of_day='07:30:00', finish_time_of_day='11:00:00',
+                finish_seconds=seconds, half1_seconds=seconds // 2, half2_seconds=seconds - seconds // 2)
+
+    def setUp(self):
+        # the generation stays 0 in tests, so drop lists built by other tests
+        percentiles._finish_times = None
+
+    def test_lookup(self):
+        times = FinishTimes(ResultGeneration.current())
+        gender, division = normalize_cohort('F', 'F35-39')
+        self.assertEqual((gender, division), ('Female', '35-39'))
+        # a tie is placed with the tied runner and beats neither of them
+        self.assertEqual(times.lookup(13500, None, gender, division),
+                         {'runners': 3, 'place': 2, 'percentile': 33.3})
+        self.assertEqual(times.lookup(11000, 'Chicago Marathon 2023', None, None)['percentile'], 100.0)
+        self.assertIsNone(times.lookup(11000, 'Boston 2024', None, None))
+
+    def test_percentile_api(self):
+        response = self.client.get('/marathon_analytics/api/percentile',
+                                   {'time': '3:50:00', 'gender': 'F', 'division': 'F35-39'})
+        self.assertEqual(response.json()['place'], 3)
+        self.assertEqual(self.client.get('/marathon_analytics/api/percentile', {'time': 'x'}).status_code, 400)
+
+
+class PassingCountsTests(TestCase):
+    '''Compare passing_counts() with a direct count over every pair of runners.'''
+
+    def brute_force(self, times):
+        passed = [sum(1 for s, f in times if s < start and f > finish) for start, finish in times]
+        passed_by = [sum(1 for s, f in times if s > start and f < finish) for start, finish in times]
+        return passed, passed_by
+
+    def test_matches_brute_force(self):
+        rng = random.Random(412)
+        cases = [[], [(1, 1)], [(1, 5), (1, 5), (2, 4), (0, 6), (2, 6), (0, 4)]]
+        # small ranges make tied start and finish times common
+        for size in [5, 20, 100]:
+            cases.append([(rng.randint(0, 5), rng.randint(0, 5)) for _ in range(size)])
+        for times in cases:
+            with self.subTest(times=times):
+                self.assertEqual(passing_counts(times), self.brute_force(times))
+
+
+def result_line(bib, place, start, finish, first_name='Ann'):
+    '''Return a line of the results file for one runner, taking the given start and finish times of day.'''
+    return (f'{bib},{first_name},Lee,USA,Chicago,IL,Female,30-34,{place},{place},{place},'
+            f'{start},{finish},03:00:00,01:30:00,01:30:00')
+
+
+class ResultLoaderTests(TestCase):
+    '''Load small results files for two races with load_results() and load_marathon.'''
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_results_file(self, lines, name='results.csv'):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join([','.join(RESULT_COLUMNS)] + lines) + '\n')
+        return path
+
+    def runners(self, race):
+        '''Return (bib, runners_passed, runners_passed_by) for each runner of `race`, by bib.'''
+        return list(Result.objects.filter(race=race).order_by('bib')
+                    .values_list('bib', 'runners_passed', 'runners_passed_by'))
+
+    def test_reloading_a_race_leaves_other_races_alone(self):
+        # bib 2 starts after bib 1 and finishes before, passing them
+        load_results(self.write_results_file([
+            result_line(1, 2, '07:30:00', '10:30:00'),
+            result_line(2, 1, '07:40:00', '10:20:00'),
+        ], 'a.csv'), race='Race A')
+        # had Race A been counted too, bib 3 would be passed by both of its runners
+        load_results(self.write_results_file([result_line(3, 1, '07:20:00', '11:00:00')], 'b.csv'),
+                     race='Race B')
+        self.assertEqual(self.runners('Race A'), [(1, 0, 1), (2, 1, 0)])
+        self.assertEqual(self.runners('Race B'), [(3, 0, 0)])
+
+        stats = load_results(self.write_results_file([result_line(4, 1, '07:30:00', '10:00:00')], 'a2.csv'),
+                             race='Race A')
+        self.assertEqual(stats['loaded'], 1)
+        self.assertEqual(self.runners('Race A'), [(4, 0, 0)])
+        self.assertEqual(self.runners('Race B'), [(3, 0, 0)])
+        self.assertEqual(ResultGeneration.current(), 3)
+
+    def test_export_names_the_race_of_each_row(self):
+        load_results(self.write_results_file([result_line(1, 1, '07:30:00', '10:30:00')], 'b.csv'), race='Race B')
+        load_results(self.write_results_file([result_line(2, 1, '07:30:00', '10:30:00')], 'a.csv'), race='Race A')
+        header, *rows = result_export_rows({})
+        self.assertEqual(header[:2], ['race', 'bib'])
+        self.assertEqual([(row[0], row[1]) for row in rows], [('Race A', 2), ('Race B', 1)])
+        self.assertEqual(rows[0][-3:], ['03:00:00', '01:30:00', '01:30:00'])
+
+    def test_rejected_rows_go_to_the_side_file(self):
+        path = self.write_results_file([
+            result_line(1, 1, '07:30:00', '10:30:00'),
+            result_line('x', 2, '07:30:00', '10:40:00'),
+            result_line(3, 3, '07:30:00', '3:75:00'),
+        ])
+        stats = load_results(path, race='Race A')
+        self.assertEqual((stats['loaded'], stats['rejected']), (1, 2))
+        self.assertEqual(stats['reject_filename'], path + '.rejects.csv')
+        with open(stats['reject_filename'], encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        # the reject file names the source line of each rejected row
+        self.assertEqual([line.split(',')[0] for line in lines[1:]], ['3', '4'])
+
+    def test_results_count_is_cached_until_the_next_load(self):
+        load_results(self.write_results_file([result_line(bib, bib, '07:30:00', '10:30:00')
+                                              for bib in range(1, 61)]), race='Race A')
+        cache.clear()
+        url = reverse('results_list')
+        self.assertEqual(self.client.get(url).context['paginator'].count, 60)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'page': 2})
+        self.assertEqual(len(response.context['results']), 10)
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql']])
+
+        load_results(self.write_results_file([result_line(1, 1, '07:30:00', '10:30:00')], 'b.csv'), race='Race B')
+        self.assertEqual(self.client.get(url).context['paginator'].count, 61)
+
+    def test_load_marathon_command(self):
+        path = self.write_results_file([result_line(1, 1, '07:30:00', '10:30:00')])
+        out = io.StringIO()
+        call_command('load_marathon', path, race=' Race A ', stdout=out)
+        self.assertIn('Loaded 1 results for Race A', out.getvalue())
+        self.assertEqual(self.runners('Race A'), [(1, 0, 0)])
+        with self.assertRaises(CommandError):
+            call_command('load_marathon', path, race='  ', stdout=io.StringIO())
+        self.assertEqual(Result.objects.count(), 1)
@@ -8,4 +8,7 @@ urlpatterns = [
 	path(r'', ResultsListView.as_view(), name='home'),
     path(r'results', ResultsListView.as_view(), name='results_list'),
     path(r'result/<int:pk>', ResultDetailView.as_view(), name='result_detail'),
+    path(r'autocomplete.json', ResultAutocompleteView.as_view(), name='result_autocomplete'),
+    path(r'api/percentile', PercentileView.as_view(), name='percentile_api'),
+    path(r'result/<int:pk>/charts.json', ResultChartDataView.as_view(), name='result_charts'),
 ]
\ No newline at end of file
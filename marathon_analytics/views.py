@@ -4,34 +4,56 @@ from django.shortcuts import render
 from django.db.models.query import QuerySet
 from django.shortcuts import render
 from django.views.generic import ListView, DetailView
-from . models import Result
-import plotly
-import plotly.graph_objs as go
+from django.shortcuts import get_object_or_404
+from django.views import View
+from django.http import JsonResponse
+from . models import Result, ResultGeneration
+from .parsers import format_seconds, parse_seconds
+from .percentiles import get_finish_times, normalize_cohort
+from .search import SEARCH_PARAMS, autocomplete, race_options, result_filter, search_signature
+from cs412.charts import plotly_js_url
+from cs412.generations import cache_key, cached_json_response
+from cs412.pagination import CachedCountMixin
  
-class ResultsListView(ListView):
+class ResultsListView(CachedCountMixin, ListView):
     '''View to display marathon results'''
  
     template_name = 'marathon_analytics/results.html'
     model = Result
     context_object_name = 'results'
     paginate_by = 50
+
+    def get_count_key(self):
+        '''Cache the number of results per search until the next load.'''
+        return cache_key('result_count', ResultGeneration.current(), search_signature(self.request.GET))
  
     def get_queryset(self):
         
-        # start with entire queryset
-        results = super().get_queryset().order_by('place_overall')
- 
+        # start with entire queryset, one race after another when no race is chosen
+        results = super().get_queryset().order_by('race', 'place_overall')
  
-        # filter results by these field(s):
-        if 'city' in self.request.GET:
-            city = self.request.GET['city']
-            if city:
-                results = results.filter(city=city)
-                
-        return results
+        # filter results by the search form's fields (see search.py)
+        return results.filter(result_filter(self.request.GET))
+
+    def get_context_data(self, **kwargs):
+        '''Add the races that can be chosen in the search form.'''
+        context = super().get_context_data(**kwargs)
+        context['race_options'] = race_options()
+
+        # the search alone, for building paging and export links
+        search_query = self.request.GET.copy()
+        for name in list(search_query):
+            if name not in SEARCH_PARAMS:
+                search_query.pop(name)
+        context['search_query'] = search_query.urlencode()
+        return context
     
 class ResultDetailView(DetailView):
-    '''View to show detail page for one result.'''
+    '''
+    View to show detail page for one result.
+
+    The charts are drawn in the browser from ResultChartDataView's JSON.
+    '''
  
  
     template_name = 'marathon_analytics/result_detail.html'
@@ -44,36 +66,79 @@ class ResultDetailView(DetailView):
         '''
         # start with superclass context
         context = super().get_context_data(**kwargs)
-        r = context['r']
- 
-        # create graph of first half/second half as pie chart:
-        x = ['first half', 'second half']
-        first_half_seconds = (r.time_half1.hour * 60 + r.time_half1.minute) * 60 + r.time_half1.second
-        second_half_seconds = (r.time_half2.hour * 60 + r.time_half2.minute) * 60 + r.time_half2.second
-        y = [first_half_seconds , second_half_seconds]
-        
-        # generate the Pie chart
-        fig = go.Pie(labels=x, values=y) 
-        title_text = f"Half Marathon Splits"
-        # obtain the graph as an HTML div"
-        graph_div_splits = plotly.offline.plot({"data": [fig], 
-                                         "layout_title_text": title_text,
-                                         }, 
-                                         auto_open=False, 
-                                         output_type="div")
-        # send div as template context variable
-        context['graph_div_splits'] = graph_div_splits
- 
-		# create graph of runners who passed/passed by
-        x= [f'Runners Passed by {r.first_name}', f'Runners who Passed {r.first_name}']
-        y = [r.get_runners_passed(), r.get_runners_passed_by()]
-        
-        fig = go.Bar(x=x, y=y)
-        title_text = f"Runners Passed/Passed By"
-        graph_div_passed = plotly.offline.plot({"data": [fig], 
-                                         "layout_title_text": title_text,
-                                         }, auto_open=False, output_type="div",               
-                                         ) 
-        context['graph_div_passed'] = graph_div_passed
-
-        return context
\ No newline at end of file
+
+        # both charts share one cached copy of plotly.js loaded by the template
+        context['plotly_js_url'] = plotly_js_url()
+
+        return context
+
+
+def result_chart_series(r):
+    '''Return the data behind the two charts of one result's detail page.'''
+    return {
+        'splits': {
+            # first half/second half, in seconds, for the pie chart
+            'labels': ['first half', 'second half'],
+            'values': [r.half1_seconds, r.half2_seconds],
+        },
+        'passed': {
+            'labels': [f'Runners Passed by {r.first_name}', f'Runners who Passed {r.first_name}'],
+            'values': [r.runners_passed, r.runners_passed_by],
+        },
+    }
+
+
+class ResultChartDataView(View):
+    '''
+    Return the chart data for one result as JSON, cached per result and
+    ResultGeneration so it is only computed once per load.
+    '''
+
+    def get(self, request, pk):
+        r = get_object_or_404(Result, pk=pk)
+        key = cache_key('result_charts', ResultGeneration.current(), str(pk))
+        return cached_json_response(request, key, lambda: result_chart_series(r))
+
+
+class ResultAutocompleteView(View):
+    '''
+    Return name or city suggestions for the search form as JSON:
+    ?field=name|city&q=<prefix>[&race=<race>].
+    '''
+
+    def get(self, request):
+        field = request.GET.get('field', 'name')
+        prefix = request.GET.get('q', '')
+        race = request.GET.get('race', '')
+        key = cache_key('result_autocomplete', ResultGeneration.current(), f'{field}|{race}|{prefix.lower()}')
+        return cached_json_response(request, key, lambda: {
+            'field': field,
+            'query': prefix,
+            'results': autocomplete(field, prefix, race),
+        })
+
+
+class PercentileView(View):
+    '''
+    Return the percentile and would-be place of a finish time as JSON:
+    ?time=H:MM:SS[&race=<race>][&gender=F|M][&division=F35-39].
+
+    Answered from the finish times held in memory (see percentiles.py),
+    so requests do not query the database.
+    '''
+
+    def get(self, request):
+        try:
+            seconds = parse_seconds(request.GET.get('time', ''))
+        except ValueError:
+            return JsonResponse({'error': 'time must be given as H:MM:SS or MM:SS'}, status=400)
+
+        race = request.GET.get('race', '').strip()
+        gender, division = normalize_cohort(request.GET.get('gender'), request.GET.get('division'))
+        answer = get_finish_times().lookup(seconds, race, gender, division)
+
+        cohort = {'time': format_seconds(seconds), 'race': race or None,
+                  'gender': gender, 'division': division}
+        if answer is None:
+            return JsonResponse(dict(cohort, error='no results in this cohort'), status=404)
+        return JsonResponse(dict(cohort, **answer))
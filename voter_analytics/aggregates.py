@@ -0,0 +1,147 @@
+# voter_analytics/aggregates.py
+# Ting Shing Liu, 10/18/26
+# The voter summary table and the graph data computed from it
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from cs412.generations import cache_key, get_or_compute
+from cs412.histograms import histogram
+from .elections import ELECTION_BITS, ELECTION_FIELDS, ELECTION_LABELS, count_per_election
+from .engines import get_engine
+from .filters import normalize_filters, participation_filter, voter_filter
+from .models import Voter, VoterGeneration, VoterSummary
+
+# The Voter attributes the summary table is grouped by
+SUMMARY_FIELDS = ['party_id', 'birth_year', 'voter_score', 'participation_mask']
+
+
+def rebuild_voter_summary():
+    """
+    Replaces the contents of VoterSummary with voter counts grouped by
+    SUMMARY_FIELDS. Returns the number of summary rows written.
+    """
+    groups = Voter.objects.values(*SUMMARY_FIELDS).annotate(count=Count('pk')).order_by()
+    with transaction.atomic():
+        VoterSummary.objects.all().delete()
+        rows = VoterSummary.objects.bulk_create(VoterSummary(**group) for group in groups)
+    return len(rows)
+
+
+def voter_graph_data(params, year_bin_width=1):
+    """
+    Computes the data behind the graphs page for the filter form's GET
+    parameters by adding up VoterSummary rows, without reading Voter.
+
+    Returns a dict with (first birth year, count) pairs for bins of
+    `year_bin_width` years, (party, count) pairs sorted by count, and the
+    number of voters per election.
+
+    With an in-memory engine enabled (see engines.py) the data comes
+    from its index of Voter instead.
+    """
+    engine = get_engine()
+    if engine is not None:
+        return engine.graph_data(normalize_filters(params), year_bin_width)
+
+    summary = VoterSummary.objects.filter(voter_filter(params))
+
+    birth_years = histogram(summary, 'birth_year', year_bin_width, weight='count')
+    parties = summary.values_list('party__code').annotate(count=Sum('count')).order_by('-count')
+    masks = summary.values_list('participation_mask').annotate(count=Sum('count')).order_by()
+
+    return {
+        'birth_years': birth_years,
+        'parties': list(parties),
+        'elections': count_per_election(masks),
+    }
+
+
+def voter_graph_series(params, year_bin_width=1):
+    """
+    Returns voter_graph_data() as compact, JSON-ready series for the
+    charts drawn in the browser on the graphs page.
+    """
+    data = voter_graph_data(params, year_bin_width)
+    return {
+        'birth_years': {
+            'x': [year for year, count in data['birth_years']],
+            'y': [count for year, count in data['birth_years']],
+            'bin_width': year_bin_width,
+        },
+        'parties': {
+            'labels': [party for party, count in data['parties']],
+            'values': [count for party, count in data['parties']],
+        },
+        'elections': {
+            'labels': ELECTION_LABELS,
+            'values': data['elections'],
+        },
+    }
+
+
+def voter_filter_options(generation=None):
+    """
+    Returns the party and voter score choices of the filter form.
+
+    They are read from the small VoterSummary table rather than Voter,
+    and cached until the next load (`generation` defaults to the current
+    VoterGeneration).
+    """
+    if generation is None:
+        generation = VoterGeneration.current()
+
+    def compute():
+        return {
+            'party_options': list(VoterSummary.objects.values_list('party__code', flat=True)
+                                  .distinct().order_by('party__code')),
+            'score_options': list(VoterSummary.objects.values_list('voter_score', flat=True)
+                                  .distinct().order_by('-voter_score')),
+        }
+
+    return get_or_compute(cache_key('voter_filter_options', generation), compute)
+
+
+def voter_turnout():
+    """
+    Returns the number of voters and the turnout in every election for
+    each precinct and party, computed in one query with conditional
+    counts.
+
+    Returns a JSON-ready dict with the elections (name and label) and one
+    row per (precinct, party) holding the number of voters and, in
+    election order, how many of them voted and the turnout rate.
+    """
+    voted = {f"voted_{name}": Count('pk', filter=participation_filter(bit))
+             for name, bit in ELECTION_BITS.items()}
+    groups = (Voter.objects.values('precinct__number', 'party__code')
+              .annotate(voters=Count('pk'), **voted)
+              .order_by('precinct__number', 'party__code'))
+
+    rows = []
+    for group in groups:
+        counts = [group[f"voted_{name}"] for name in ELECTION_FIELDS]
+        rows.append({
+            'precinct': group['precinct__number'],
+            'party': group['party__code'],
+            'voters': group['voters'],
+            'voted': counts,
+            'turnout': [round(count / group['voters'], 4) for count in counts],
+        })
+
+    return {
+        'elections': [{'name': name, 'label': label} for name, label in zip(ELECTION_FIELDS, ELECTION_LABELS)],
+        'rows': rows,
+    }
+
+
+def voter_turnout_csv_rows(turnout):
+    """Yields voter_turnout() as CSV rows, with a voted and a turnout column per election."""
+    header = ['precinct', 'party', 'voters']
+    for name in ELECTION_FIELDS:
+        header += [f"{name}_voted", f"{name}_turnout"]
+    yield header
+    for row in turnout['rows']:
+        values = [row['precinct'], row['party'], row['voters']]
+        for count, rate in zip(row['voted'], row['turnout']):
+            values += [count, rate]
+        yield values
@@ -0,0 +1,143 @@
+# voter_analytics/columnar.py
+# Ting Shing Liu, 10/18/26
+# Optional in-memory column snapshot of the Voter table, filtered with NumPy
+#
+# Enabled with VOTER_ANALYTICS_ENGINE = 'columnar' in settings.py when NumPy
+# is installed (see engines.py); otherwise the views query the database.
+
+import threading
+from .elections import ALL_ELECTIONS, count_per_election
+from .models import Voter, VoterGeneration
+
+try:
+    import numpy as np
+except ImportError: # NumPy is optional
+    np = None
+
+
+class VoterColumns:
+    """
+    The columns of the Voter table that the filter form and graphs use,
+    as NumPy arrays in primary key order, for one load generation.
+    """
+
+    def __init__(self, generation):
+        self.generation = generation
+        rows = list(Voter.objects.order_by('pk').values_list(
+            'pk', 'party__code', 'birth_year', 'voter_score', 'participation_mask'))
+
+        # parties are stored as indexes into the sorted list of parties
+        self.parties = sorted({row[1] for row in rows})
+        party_codes = {party: code for code, party in enumerate(self.parties)}
+
+        self.pks = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        self.party = np.fromiter((party_codes[row[1]] for row in rows), dtype=np.int16, count=len(rows))
+        self.birth_year = np.fromiter((row[2] for row in rows), dtype=np.int16, count=len(rows))
+        self.voter_score = np.fromiter((row[3] for row in rows), dtype=np.int8, count=len(rows))
+        self.participation = np.fromiter((row[4] for row in rows), dtype=np.uint8, count=len(rows))
+
+    def __len__(self):
+        return len(self.pks)
+
+    def match(self, filters):
+        """
+        Returns a boolean array marking the voters that match `filters`,
+        a dict from filters.normalize_filters().
+        """
+        selected = np.ones(len(self), dtype=bool)
+        if 'party' in filters:
+            if filters['party'] not in self.parties:
+                return np.zeros(len(self), dtype=bool)
+            selected &= self.party == self.parties.index(filters['party'])
+        if 'min_year' in filters:
+            selected &= self.birth_year >= filters['min_year']
+        if 'max_year' in filters:
+            selected &= self.birth_year <= filters['max_year']
+        if 'voter_score' in filters:
+            selected &= self.voter_score == filters['voter_score']
+        if 'elections' in filters:
+            required = filters['elections']
+            selected &= (self.participation & required) == required
+        return selected
+
+    def count(self, filters):
+        """Returns the number of voters matching `filters`."""
+        return int(np.count_nonzero(self.match(filters)))
+
+    def matching_pks(self, filters):
+        """Returns the primary keys of the voters matching `filters`, in order."""
+        return self.pks[self.match(filters)]
+
+    def results(self, filters):
+        """Returns the voters matching `filters` as a sequence for Django's Paginator."""
+        return SnapshotResults(self, filters)
+
+    def graph_data(self, filters, year_bin_width=1):
+        """Returns the same dict as aggregates.voter_graph_data(), computed with bincount."""
+        selected = self.match(filters)
+
+        birth_years = []
+        years = self.birth_year[selected]
+        if len(years):
+            first_bin = int(years.min()) // year_bin_width
+            counts = np.bincount(years // year_bin_width - first_bin)
+            birth_years = [((first_bin + i) * year_bin_width, int(count))
+                           for i, count in enumerate(counts) if count]
+
+        party_counts = np.bincount(self.party[selected], minlength=len(self.parties))
+        parties = sorted(((party, int(count)) for party, count in zip(self.parties, party_counts) if count),
+                         key=lambda pair: -pair[1])
+
+        mask_counts = np.bincount(self.participation[selected], minlength=ALL_ELECTIONS + 1)
+        elections = count_per_election(enumerate(mask_counts.tolist()))
+
+        return {
+            'birth_years': birth_years,
+            'parties': parties,
+            'elections': elections,
+        }
+
+
+class SnapshotResults:
+    """
+    The voters matching some filters, as a sequence Django's Paginator can
+    page through. Only the rows of the requested slice are read from the
+    database.
+    """
+
+    def __init__(self, snapshot, filters):
+        self.pks = snapshot.matching_pks(filters)
+
+    def count(self):
+        return len(self.pks)
+
+    def __len__(self):
+        return len(self.pks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            pks = self.pks[index].tolist()
+            voters = Voter.objects.select_related('party', 'street').in_bulk(pks)
+            return [voters[pk] for pk in pks if pk in voters]
+        return Voter.objects.get(pk=int(self.pks[index]))
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot(generation=None):
+    """
+    Returns the VoterColumns snapshot for `generation` (default: the
+    current VoterGeneration), rebuilding it once after every load.
+    """
+    global _snapshot
+    if generation is None:
+        generation = VoterGeneration.current()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.generation != generation:
+        with _snapshot_lock:
+            if _snapshot is None or _snapshot.generation != generation:
+                _snapshot = VoterColumns(generation)
+            snapshot = _snapshot
+    return snapshot
@@ -0,0 +1,51 @@
+# voter_analytics/elections.py
+# Ting Shing Liu, 10/18/26
+# The elections tracked in the voter file and the bitmask that stores them
+
+# The election participation columns, in file order
+ELECTION_FIELDS = ['v20state', 'v21town', 'v21primary', 'v22general', 'v23town']
+
+# Labels used on the graphs page
+ELECTION_LABELS = ['20 State', '21 Town', '21 Primary', '22 General', '23 Town']
+
+# Each election is one bit of Voter.participation_mask
+ELECTION_BITS = {name: 1 << i for i, name in enumerate(ELECTION_FIELDS)}
+
+# The mask of a voter who took part in every election
+ALL_ELECTIONS = (1 << len(ELECTION_FIELDS)) - 1
+
+
+def participation_mask(flags):
+    """Packs one boolean per election (in ELECTION_FIELDS order) into a mask."""
+    mask = 0
+    for i, voted in enumerate(flags):
+        if voted:
+            mask |= 1 << i
+    return mask
+
+
+def required_mask(params):
+    """Returns the mask of the elections checked in the filter form's GET parameters."""
+    mask = 0
+    for name, bit in ELECTION_BITS.items():
+        if params.get(name):
+            mask |= bit
+    return mask
+
+
+def masks_with_bits(required):
+    """Returns every participation mask that includes all the bits of `required`."""
+    return [mask for mask in range(ALL_ELECTIONS + 1) if mask & required == required]
+
+
+def count_per_election(mask_counts):
+    """
+    Turns (participation_mask, count) pairs into the number of voters who
+    took part in each election, in ELECTION_FIELDS order.
+    """
+    totals = [0] * len(ELECTION_FIELDS)
+    for mask, count in mask_counts:
+        for i in range(len(ELECTION_FIELDS)):
+            if mask & (1 << i):
+                totals[i] += count
+    return totals
@@ -0,0 +1,21 @@
+# voter_analytics/engines.py
+# Ting Shing Liu, 10/18/26
+# Chooses how voter filters are answered, from VOTER_ANALYTICS_ENGINE
+
+from django.conf import settings
+from . import bitmaps, columnar
+
+
+def get_engine(generation=None):
+    """
+    Returns the in-memory index selected by VOTER_ANALYTICS_ENGINE for
+    `generation`, or None if filters should be answered by the database.
+
+    'columnar' needs NumPy; without it the database is used.
+    """
+    name = getattr(settings, 'VOTER_ANALYTICS_ENGINE', 'orm')
+    if name == 'columnar' and columnar.np is not None:
+        return columnar.get_snapshot(generation)
+    if name == 'bitmap':
+        return bitmaps.get_bitmaps(generation)
+    return None
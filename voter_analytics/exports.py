@@ -0,0 +1,49 @@
+# voter_analytics/exports.py
+# Ting Shing Liu, 10/18/26
+# CSV export of the voters matching the filter form
+
+from .elections import ELECTION_FIELDS
+from .filters import voter_filter
+from .models import Voter
+from .parsers import VOTER_COLUMNS
+
+# Rows read from the database per round trip while exporting
+EXPORT_CHUNK_SIZE = 2000
+
+# Voter fields read for each exported row
+EXPORT_FIELDS = [
+    'voter_id', 'last_name', 'first_name', 'street_number', 'street__name',
+    'apartment_number', 'zip_code', 'date_of_birth', 'date_of_registration',
+    'party__code', 'precinct__number', 'participation_mask', 'voter_score',
+]
+
+
+def export_row(values):
+    """
+    Turns a tuple of EXPORT_FIELDS values into a row in the voter file's
+    format, with one TRUE/FALSE column per election.
+    """
+    row = ['' if value is None else value for value in values[:-2]]
+    mask, voter_score = values[-2:]
+    row += ['TRUE' if mask & (1 << i) else 'FALSE' for i in range(len(ELECTION_FIELDS))]
+    row.append(voter_score)
+    return row
+
+
+def voter_export_queryset(params):
+    """Returns the EXPORT_FIELDS values of the voters matching `params`, in pk order."""
+    return Voter.objects.filter(voter_filter(params)).order_by('pk').values_list(*EXPORT_FIELDS)
+
+
+def voter_export_rows(params):
+    """
+    Yields the header and then one row per voter matching the filter
+    form's GET parameters, in the same column order as the voter file so
+    an export can be loaded again with load_voters.
+
+    Voters are read with a server-side iterator in chunks of
+    EXPORT_CHUNK_SIZE, so memory use does not grow with the export.
+    """
+    yield VOTER_COLUMNS
+    for values in voter_export_queryset(params).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield export_row(values)
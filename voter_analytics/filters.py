@@ -0,0 +1,95 @@
+# voter_analytics/filters.py
+# Ting Shing Liu, 10/18/26
+# Translates the voter filter form into a database query
+
+from django.db.models import Q
+from .elections import ELECTION_FIELDS, masks_with_bits, required_mask
+
+# GET parameters understood by the filter form, in form order
+FILTER_PARAMS = ['party', 'min_year', 'max_year', 'voter_score'] + ELECTION_FIELDS
+
+
+def parse_int(value):
+    """Returns `value` as an int, or None if it is empty or not a number."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def participation_filter(required):
+    """
+    Returns a Q matching voters who took part in every election whose bit
+    is set in `required`.
+
+    The predicate is written as participation_mask IN (...) over the masks
+    that contain those bits, which, unlike a bitwise AND in SQL, can be
+    answered from the participation_mask index.
+    """
+    return Q(participation_mask__in=masks_with_bits(required))
+
+
+def normalize_filters(params):
+    """
+    Reads the filter form's GET parameters into a dict holding only the
+    filters in use: 'party' (str), 'min_year', 'max_year', 'voter_score'
+    (ints) and 'elections' (the mask of checked elections).
+
+    Empty or malformed values are dropped, and election checkboxes only
+    count when they are checked.
+    """
+    filters = {}
+
+    party = params.get('party')
+    if party:
+        filters['party'] = party
+
+    for name in ['min_year', 'max_year', 'voter_score']:
+        value = parse_int(params.get(name))
+        if value is not None:
+            filters[name] = value
+
+    required = required_mask(params)
+    if required:
+        filters['elections'] = required
+
+    return filters
+
+
+def filter_signature(params):
+    """
+    Returns a canonical string for the filters in `params`, so requests
+    asking for the same voters share cache entries whatever the order or
+    spelling of their parameters.
+    """
+    filters = normalize_filters(params)
+    return '&'.join(f"{name}={filters[name]}" for name in sorted(filters))
+
+
+def voter_filter(params):
+    """
+    Builds a Q object from the filter form's GET parameters.
+
+    The Q only uses columns that Voter and VoterSummary share, so it can
+    filter either table.
+    """
+    filters = normalize_filters(params)
+    q = Q()
+
+    if 'party' in filters:
+        q &= Q(party__code=filters['party'])
+
+    if 'min_year' in filters:
+        q &= Q(birth_year__gte=filters['min_year'])
+
+    if 'max_year' in filters:
+        q &= Q(birth_year__lte=filters['max_year'])
+
+    if 'voter_score' in filters:
+        q &= Q(voter_score=filters['voter_score'])
+
+    # all checked elections become one predicate on participation_mask
+    if 'elections' in filters:
+        q &= participation_filter(filters['elections'])
+
+    return q
@@ -0,0 +1,195 @@
+# voter_analytics/loader.py
+# Ting Shing Liu, 10/18/26
+# Bulk loading of the Newton voter file into the Voter table
+
+import time
+from contextlib import nullcontext
+from django.db import transaction
+from cs412.ingest import RejectWriter, iter_rows
+from .aggregates import rebuild_voter_summary
+from .models import Party, Precinct, Street, Voter, VoterGeneration
+from .parsers import VOTER_COLUMNS, parse_voter_row
+from .search import name_index_suspended
+
+# Number of rows sent to the database per INSERT/UPDATE/DELETE
+BATCH_SIZE = 5000
+
+
+class Lookup:
+    """
+    Maps the values of one lookup table (e.g. Street.name) to their
+    primary keys, adding rows for values it has not seen before.
+    """
+
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self.pks = dict(model.objects.values_list(field, 'pk'))
+
+    def __call__(self, value):
+        pk = self.pks.get(value)
+        if pk is None:
+            pk = self.pks[value] = self.model.objects.create(**{self.field: value}).pk
+        return pk
+
+    def prune(self):
+        """Deletes the rows no voter refers to any more."""
+        self.model.objects.filter(voters=None).delete()
+
+
+class VoterLookups:
+    """Translates the party, precinct and street text of parsed rows into lookup keys."""
+
+    def __init__(self):
+        self.party = Lookup(Party, 'code')
+        self.precinct = Lookup(Precinct, 'number')
+        self.street = Lookup(Street, 'name')
+
+    def voter(self, row, pk=None):
+        """Returns a Voter for a row from parse_voter_row()."""
+        fields = dict(row)
+        fields['party_id'] = self.party(fields.pop('party_affiliation'))
+        fields['precinct_id'] = self.precinct(fields.pop('precinct_number'))
+        fields['street_id'] = self.street(fields.pop('street_name'))
+        return Voter(pk=pk, **fields)
+
+    def prune(self):
+        for lookup in [self.party, self.precinct, self.street]:
+            lookup.prune()
+
+
+class VoterWriter:
+    """
+    Collects Voter objects to insert or update and writes them to the
+    database in batches.
+    """
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.to_create = []
+        self.to_update = []
+        self.inserted = 0
+        self.updated = 0
+        # every field except the primary key is rewritten on update
+        self.update_fields = [f.name for f in Voter._meta.concrete_fields if not f.primary_key]
+
+    def create(self, voter):
+        self.to_create.append(voter)
+        if len(self.to_create) >= self.batch_size:
+            self.flush_creates()
+
+    def update(self, voter):
+        self.to_update.append(voter)
+        if len(self.to_update) >= self.batch_size:
+            self.flush_updates()
+
+    def flush_creates(self):
+        Voter.objects.bulk_create(self.to_create)
+        self.inserted += len(self.to_create)
+        self.to_create = []
+
+    def flush_updates(self):
+        Voter.objects.bulk_update(self.to_update, self.update_fields, batch_size=500)
+        self.updated += len(self.to_update)
+        self.to_update = []
+
+    def flush(self):
+        self.flush_creates()
+        self.flush_updates()
+
+
+def load_voters(filename, batch_size=BATCH_SIZE, reject_filename=None, workers=1,
+                incremental=False):
+    """
+    Loads the rows of `filename` into the Voter table.
+
+    By default the table is replaced: rows are inserted with bulk_create
+    in batches of `batch_size`, all inside a single transaction, so
+    readers see either the old table or the complete new one.
+
+    With incremental=True voters are matched on their voter ID number
+    and only the differences are applied: new voters are inserted,
+    voters whose row hash changed are updated, and voters missing from
+    the file are deleted. Unchanged rows are not touched.
+
+    Party, precinct and street names are stored in their lookup tables,
+    and values no voter uses any more are removed at the end.
+
+    Either way the VoterSummary table is rebuilt and VoterGeneration is
+    bumped in the same transaction. A full load also rebuilds the name
+    search index once at the end instead of row by row.
+
+    Rejected rows (including repeated voter IDs) are written to
+    `reject_filename` (default: `<filename>.rejects.csv`). With
+    workers > 1 the file is parsed in that many processes while this
+    process does the writing.
+
+    Returns a dict with the number of rows inserted, updated, deleted,
+    unchanged, loaded and rejected and the elapsed time in seconds.
+    """
+    if reject_filename is None:
+        reject_filename = f"{filename}.rejects.csv"
+    rejects = RejectWriter(reject_filename, VOTER_COLUMNS)
+
+    start = time.perf_counter()
+    writer = VoterWriter(batch_size)
+    lookups = VoterLookups()
+    unchanged = deleted = 0
+    try:
+        # after a full load the name index is rebuilt in one pass
+        index = nullcontext() if incremental else name_index_suspended()
+        with transaction.atomic(), index:
+            if incremental:
+                # voter_id -> (pk, row_hash) for every voter already loaded
+                existing = {voter_id: (pk, hash_) for voter_id, pk, hash_
+                            in Voter.objects.values_list('voter_id', 'pk', 'row_hash').iterator()}
+                stale_pks = {pk for pk, hash_ in existing.values()}
+                stale_pks.update(Voter.objects.filter(voter_id=None).values_list('pk', flat=True))
+            else:
+                Voter.objects.all().delete()
+                existing = {}
+                stale_pks = set()
+
+            seen = set()
+            for line_number, fields, row in iter_rows(filename, parse_voter_row, rejects, workers,
+                                                      with_source=True):
+                voter_id = row['voter_id']
+                if voter_id in seen:
+                    rejects.write(line_number, fields, "repeated voter ID number")
+                    continue
+                seen.add(voter_id)
+
+                match = existing.get(voter_id)
+                if match is None:
+                    writer.create(lookups.voter(row))
+                    continue
+                pk, hash_ = match
+                stale_pks.discard(pk)
+                if hash_ == row['row_hash']:
+                    unchanged += 1
+                else:
+                    writer.update(lookups.voter(row, pk))
+
+            # delete voters that are no longer in the file
+            stale_pks = sorted(stale_pks)
+            for i in range(0, len(stale_pks), batch_size):
+                deleted += Voter.objects.filter(pk__in=stale_pks[i:i + batch_size]).delete()[0]
+            writer.flush()
+
+            # the old summary rows refer to lookups that may be pruned
+            rebuild_voter_summary()
+            lookups.prune()
+            VoterGeneration.bump()
+    finally:
+        rejects.close()
+
+    return {
+        'inserted': writer.inserted,
+        'updated': writer.updated,
+        'deleted': deleted,
+        'unchanged': unchanged,
+        'loaded': writer.inserted + writer.updated + unchanged,
+        'rejected': rejects.count,
+        'reject_filename': reject_filename if rejects.count else None,
+        'seconds': time.perf_counter() - start,
+    }
@@ -0,0 +1,47 @@
+# voter_analytics/management/commands/load_voters.py
+# Ting Shing Liu, 10/18/26
+# manage.py command to bulk load the Newton voter file
+
+from django.core.management.base import BaseCommand, CommandError
+from voter_analytics.loader import BATCH_SIZE, load_voters
+
+
+class Command(BaseCommand):
+    help = "Load a Newton voter CSV file into the Voter table, replacing it or applying only the changes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Path to the voter CSV file")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f"Rows per INSERT (default {BATCH_SIZE})")
+        parser.add_argument('--rejects', metavar='PATH',
+                            help="Where to write rejected rows (default <path>.rejects.csv)")
+        parser.add_argument('--incremental', action='store_true',
+                            help="Only insert, update and delete voters whose rows changed")
+        parser.add_argument('--workers', type=int, default=1,
+                            help="Number of processes used to parse the file (default 1)")
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1:
+            raise CommandError("--workers must be at least 1")
+        try:
+            stats = load_voters(options['path'],
+                                batch_size=options['batch_size'],
+                                reject_filename=options['rejects'],
+                                workers=options['workers'],
+                                incremental=options['incremental'])
+        except OSError as e:
+            raise CommandError(f"Could not read {options['path']}: {e}")
+
+        rate = stats['loaded'] / stats['seconds'] if stats['seconds'] else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {stats['loaded']} voters in {stats['seconds']:.2f}s ({rate:,.0f} rows/s)."
+        ))
+        if options['incremental']:
+            self.stdout.write(
+                f"{stats['inserted']} inserted, {stats['updated']} updated, "
+                f"{stats['deleted']} deleted, {stats['unchanged']} unchanged."
+            )
+        if stats['rejected']:
+            self.stdout.write(self.style.WARNING(
+                f"Rejected {stats['rejected']} rows, see {stats['reject_filename']}"
+            ))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0002_voter_id_row_hash'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['party_affiliation', 'voter_score', 'date_of_birth'], name='voter_party_score_dob_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['voter_score', 'date_of_birth'], name='voter_score_dob_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['date_of_birth'], name='voter_dob_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v20state', True)), fields=['date_of_birth'], name='voter_v20state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v21town', True)), fields=['date_of_birth'], name='voter_v21town_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v21primary', True)), fields=['date_of_birth'], name='voter_v21primary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v22general', True)), fields=['date_of_birth'], name='voter_v22general_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v23town', True)), fields=['date_of_birth'], name='voter_v23town_idx'),
+        ),
+    ]
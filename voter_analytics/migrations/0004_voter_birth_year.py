@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:20
+
+from django.db import migrations, models
+from django.db.models.functions import ExtractYear
+
+
+def backfill_birth_year(apps, schema_editor):
+    """Fills birth_year for voters loaded before the column existed."""
+    Voter = apps.get_model('voter_analytics', 'Voter')
+    Voter.objects.update(birth_year=ExtractYear('date_of_birth'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0003_voter_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voter',
+            name='birth_year',
+            field=models.IntegerField(null=True),
+        ),
+        migrations.RunPython(backfill_birth_year, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='voter',
+            name='birth_year',
+            field=models.IntegerField(),
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_party_score_dob_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_score_dob_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_dob_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v20state_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v21town_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v21primary_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v22general_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v23town_idx',
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['party_affiliation', 'voter_score', 'birth_year'], name='voter_party_score_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['voter_score', 'birth_year'], name='voter_score_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['birth_year'], name='voter_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v20state', True)), fields=['birth_year'], name='voter_v20state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v21town', True)), fields=['birth_year'], name='voter_v21town_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v21primary', True)), fields=['birth_year'], name='voter_v21primary_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v22general', True)), fields=['birth_year'], name='voter_v22general_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(condition=models.Q(('v23town', True)), fields=['birth_year'], name='voter_v23town_idx'),
+        ),
+    ]
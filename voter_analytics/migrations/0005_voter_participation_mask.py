@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:40
+
+from django.db import migrations, models
+from django.db.models import Case, Value, When
+
+ELECTION_FIELDS = ['v20state', 'v21town', 'v21primary', 'v22general', 'v23town']
+
+
+def pack_participation(apps, schema_editor):
+    """Packs the five election booleans into participation_mask."""
+    Voter = apps.get_model('voter_analytics', 'Voter')
+    mask = Value(0)
+    for i, name in enumerate(ELECTION_FIELDS):
+        mask = mask + Case(When(**{name: True}, then=Value(1 << i)), default=Value(0))
+    Voter.objects.update(participation_mask=mask)
+
+
+def unpack_participation(apps, schema_editor):
+    """Restores the five election booleans from participation_mask."""
+    Voter = apps.get_model('voter_analytics', 'Voter')
+    for i, name in enumerate(ELECTION_FIELDS):
+        masks = [mask for mask in range(1 << len(ELECTION_FIELDS)) if mask & (1 << i)]
+        Voter.objects.filter(participation_mask__in=masks).update(**{name: True})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0004_voter_birth_year'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voter',
+            name='participation_mask',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(pack_participation, unpack_participation),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v20state_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v21town_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v21primary_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v22general_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_v23town_idx',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='v20state',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='v21town',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='v21primary',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='v22general',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='v23town',
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['participation_mask', 'birth_year'], name='voter_participation_idx'),
+        ),
+    ]
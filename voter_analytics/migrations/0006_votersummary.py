@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:07
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def build_summary(apps, schema_editor):
+    """Fills VoterSummary from the voters already loaded."""
+    Voter = apps.get_model('voter_analytics', 'Voter')
+    VoterSummary = apps.get_model('voter_analytics', 'VoterSummary')
+    fields = ['party_affiliation', 'birth_year', 'voter_score', 'participation_mask']
+    groups = Voter.objects.values(*fields).annotate(count=Count('pk')).order_by()
+    VoterSummary.objects.bulk_create(VoterSummary(**group) for group in groups)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0005_voter_participation_mask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoterSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('party_affiliation', models.CharField(max_length=2)),
+                ('birth_year', models.IntegerField()),
+                ('voter_score', models.IntegerField()),
+                ('participation_mask', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField()),
+            ],
+        ),
+        migrations.RunPython(build_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0007_votergeneration'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['last_name', 'first_name', 'id'], name='voter_name_idx'),
+        ),
+    ]
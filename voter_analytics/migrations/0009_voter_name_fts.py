@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:02
+
+from django.db import migrations
+
+# The SQL is copied here as it was when this migration was written, so
+# later changes to voter_analytics.search do not change this migration.
+
+# An FTS5 trigram index of voter names that stores no copy of them
+# (content=...), and the triggers keeping it in sync with Voter
+CREATE_SQL = [
+    """CREATE VIRTUAL TABLE voter_analytics_voter_fts USING fts5(
+    last_name, first_name,
+    content='voter_analytics_voter', content_rowid='id', tokenize='trigram')""",
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_insert
+        AFTER INSERT ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(rowid, last_name, first_name)
+            VALUES (new.id, new.last_name, new.first_name);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_delete
+        AFTER DELETE ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts, rowid, last_name, first_name)
+            VALUES ('delete', old.id, old.last_name, old.first_name);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_update
+        AFTER UPDATE OF last_name, first_name ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts, rowid, last_name, first_name)
+            VALUES ('delete', old.id, old.last_name, old.first_name);
+            INSERT INTO voter_analytics_voter_fts(rowid, last_name, first_name)
+            VALUES (new.id, new.last_name, new.first_name);
+        END""",
+    "INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS voter_analytics_voter_fts_insert",
+    "DROP TRIGGER IF EXISTS voter_analytics_voter_fts_delete",
+    "DROP TRIGGER IF EXISTS voter_analytics_voter_fts_update",
+    "DROP TABLE IF EXISTS voter_analytics_voter_fts",
+]
+
+
+def run_sqlite(statements):
+    """Returns a RunPython function that runs `statements` on SQLite only."""
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return # other databases fall back to LIKE queries
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0008_voter_name_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
@@ -0,0 +1,186 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+# (lookup model, its value field, the Voter column it replaces, the new foreign key)
+LOOKUPS = [
+    ('Party', 'code', 'party_affiliation', 'party'),
+    ('Precinct', 'number', 'precinct_number', 'precinct'),
+    ('Street', 'name', 'street_name', 'street'),
+]
+
+def fill_lookups(apps, schema_editor):
+    """Moves the party, precinct and street text into the lookup tables."""
+    Voter = apps.get_model('voter_analytics', 'Voter')
+    VoterSummary = apps.get_model('voter_analytics', 'VoterSummary')
+    for model_name, field, column, key in LOOKUPS:
+        Lookup = apps.get_model('voter_analytics', model_name)
+        values = set(Voter.objects.values_list(column, flat=True).distinct())
+        if key == 'party':
+            values.update(VoterSummary.objects.values_list(column, flat=True).distinct())
+        Lookup.objects.bulk_create(Lookup(**{field: value}) for value in sorted(values))
+
+        lookup_pk = Subquery(Lookup.objects.filter(**{field: OuterRef(column)}).values('pk')[:1])
+        Voter.objects.update(**{key: lookup_pk})
+        if key == 'party':
+            VoterSummary.objects.update(party=lookup_pk)
+
+
+def empty_lookups(apps, schema_editor):
+    """Copies the lookup values back into the text columns."""
+    Voter = apps.get_model('voter_analytics', 'Voter')
+    VoterSummary = apps.get_model('voter_analytics', 'VoterSummary')
+    for model_name, field, column, key in LOOKUPS:
+        Lookup = apps.get_model('voter_analytics', model_name)
+        value = Subquery(Lookup.objects.filter(pk=OuterRef(key)).values(field)[:1])
+        Voter.objects.update(**{column: value})
+        if key == 'party':
+            VoterSummary.objects.update(party_affiliation=value)
+
+
+# The name index's triggers from migration 0009, copied as they were when
+# this migration was written, and the statement re-indexing every voter
+FTS_TRIGGER_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_insert
+        AFTER INSERT ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(rowid, last_name, first_name)
+            VALUES (new.id, new.last_name, new.first_name);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_delete
+        AFTER DELETE ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts, rowid, last_name, first_name)
+            VALUES ('delete', old.id, old.last_name, old.first_name);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_update
+        AFTER UPDATE OF last_name, first_name ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts, rowid, last_name, first_name)
+            VALUES ('delete', old.id, old.last_name, old.first_name);
+            INSERT INTO voter_analytics_voter_fts(rowid, last_name, first_name)
+            VALUES (new.id, new.last_name, new.first_name);
+        END""",
+]
+
+FTS_REBUILD = "INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts) VALUES ('rebuild')"
+
+
+def restore_fts_triggers(apps, schema_editor):
+    """
+    Recreates the name index's triggers (migration 0009), which rebuilding
+    the Voter table drops, and rebuilds the index, on SQLite only.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in FTS_TRIGGER_SQL + [FTS_REBUILD]:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0009_voter_name_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.CreateModel(
+            name='Party',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=2, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Precinct',
+            fields=[
+                ('id', models.SmallAutoField(primary_key=True, serialize=False)),
+                ('number', models.CharField(max_length=5, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Street',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=200, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='voter',
+            name='party',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='voters', to='voter_analytics.party'),
+        ),
+        migrations.AddField(
+            model_name='voter',
+            name='precinct',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='voters', to='voter_analytics.precinct'),
+        ),
+        migrations.AddField(
+            model_name='voter',
+            name='street',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='voters', to='voter_analytics.street'),
+        ),
+        migrations.AddField(
+            model_name='votersummary',
+            name='party',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='voter_analytics.party'),
+        ),
+        migrations.RunPython(fill_lookups, empty_lookups),
+        # state-only defaults, so that reversing the RemoveFields below can
+        # re-add the columns to tables with rows before empty_lookups fills them
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(model_name='voter', name='party_affiliation',
+                                  field=models.CharField(default='', max_length=2)),
+            migrations.AlterField(model_name='voter', name='precinct_number',
+                                  field=models.CharField(default='', max_length=5)),
+            migrations.AlterField(model_name='voter', name='street_name',
+                                  field=models.CharField(default='', max_length=200)),
+            migrations.AlterField(model_name='votersummary', name='party_affiliation',
+                                  field=models.CharField(default='', max_length=2)),
+        ]),
+        migrations.RemoveIndex(
+            model_name='voter',
+            name='voter_party_score_year_idx',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='party_affiliation',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='precinct_number',
+        ),
+        migrations.RemoveField(
+            model_name='voter',
+            name='street_name',
+        ),
+        migrations.RemoveField(
+            model_name='votersummary',
+            name='party_affiliation',
+        ),
+        migrations.AlterField(
+            model_name='voter',
+            name='party',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='voters', to='voter_analytics.party'),
+        ),
+        migrations.AlterField(
+            model_name='voter',
+            name='precinct',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='voters', to='voter_analytics.precinct'),
+        ),
+        migrations.AlterField(
+            model_name='voter',
+            name='street',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='voters', to='voter_analytics.street'),
+        ),
+        migrations.AlterField(
+            model_name='votersummary',
+            name='party',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='voter_analytics.party'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['party', 'voter_score', 'birth_year'], name='voter_party_score_year_idx'),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+    ]
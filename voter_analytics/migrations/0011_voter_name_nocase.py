@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:00
+
+from django.db import migrations, models
+
+# The name index's triggers from migration 0009, copied as they were when
+# this migration was written, and the statement re-indexing every voter
+FTS_TRIGGER_SQL = [
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_insert
+        AFTER INSERT ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(rowid, last_name, first_name)
+            VALUES (new.id, new.last_name, new.first_name);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_delete
+        AFTER DELETE ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts, rowid, last_name, first_name)
+            VALUES ('delete', old.id, old.last_name, old.first_name);
+        END""",
+    """CREATE TRIGGER IF NOT EXISTS voter_analytics_voter_fts_update
+        AFTER UPDATE OF last_name, first_name ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts, rowid, last_name, first_name)
+            VALUES ('delete', old.id, old.last_name, old.first_name);
+            INSERT INTO voter_analytics_voter_fts(rowid, last_name, first_name)
+            VALUES (new.id, new.last_name, new.first_name);
+        END""",
+]
+
+FTS_REBUILD = "INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts) VALUES ('rebuild')"
+
+
+def restore_fts_triggers(apps, schema_editor):
+    """
+    Recreates the name index's triggers, which changing the collation
+    drops along with the rebuilt Voter table, and rebuilds the index, on
+    SQLite only.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in FTS_TRIGGER_SQL + [FTS_REBUILD]:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0010_voter_lookup_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_fts_triggers),
+        migrations.AlterField(
+            model_name='voter',
+            name='last_name',
+            field=models.CharField(db_collation='NOCASE', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='voter',
+            name='first_name',
+            field=models.CharField(db_collation='NOCASE', max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['first_name'], name='voter_first_name_idx'),
+        ),
+        migrations.RunPython(restore_fts_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voter_analytics', '0011_voter_name_nocase'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['party', 'last_name', 'first_name', 'id'], name='voter_party_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voter',
+            index=models.Index(fields=['voter_score', 'last_name', 'first_name', 'id'], name='voter_score_name_idx'),
+        ),
+    ]
@@ -2,79 +2,168 @@
 # Ting Shing Liu, 10/31/25
 # Models for Voter Analytics app
 
-from datetime import datetime
 from django.db import models
+from cs412.generations import LoadGeneration
+from .elections import ELECTION_BITS
+
+class Party(models.Model):
+    """A party affiliation code from the voter file, e.g. 'D' or 'U'."""
+    id = models.SmallAutoField(primary_key=True)
+    code = models.CharField(max_length=2, unique=True)
+
+    def __str__(self):
+        return self.code
+
+
+class Precinct(models.Model):
+    """A voting precinct of Newton, by its number in the voter file."""
+    id = models.SmallAutoField(primary_key=True)
+    number = models.CharField(max_length=5, unique=True)
+
+    def __str__(self):
+        return self.number
+
+
+class Street(models.Model):
+    """A street name, stored once however many voters live on it."""
+    id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=200, unique=True)
+
+    def __str__(self):
+        return self.name
+
 
 class Voter(models.Model):
     """
     Represents a registered voter in Newton, MA.
+
+    Party, precinct and street are small integer keys into lookup tables;
+    the party_affiliation, precinct_number and street_name properties
+    read their values (use select_related to avoid a query per voter).
     """
+    # Voter ID number from the city's file, stable across reloads
+    voter_id = models.CharField(max_length=20, unique=True, blank=True, null=True)
+
     # Personal & Address Info
-    last_name = models.CharField(max_length=100)
-    first_name = models.CharField(max_length=100)
+    # NOCASE names let case-insensitive prefix matches use the name indexes
+    last_name = models.CharField(max_length=100, db_collation='NOCASE')
+    first_name = models.CharField(max_length=100, db_collation='NOCASE')
     street_number = models.IntegerField()
-    street_name = models.CharField(max_length=200)
+    street = models.ForeignKey(Street, on_delete=models.PROTECT, related_name='voters')
     apartment_number = models.CharField(max_length=20, blank=True, null=True)
     zip_code = models.CharField(max_length=10)
     
     # Voter Info
     date_of_birth = models.DateField()
+    # Copy of date_of_birth's year so year filters can use an index
+    birth_year = models.IntegerField()
     date_of_registration = models.DateField()
-    party_affiliation = models.CharField(max_length=2)
-    precinct_number = models.CharField(max_length=5)
-
-    # Election Participation (Booleans)
-    v20state = models.BooleanField(default=False)
-    v21town = models.BooleanField(default=False)
-    v21primary = models.BooleanField(default=False)
-    v22general = models.BooleanField(default=False)
-    v23town = models.BooleanField(default=False)
+    # no separate index on party: voter_party_score_year_idx starts with it
+    party = models.ForeignKey(Party, on_delete=models.PROTECT, related_name='voters', db_index=False)
+    precinct = models.ForeignKey(Precinct, on_delete=models.PROTECT, related_name='voters')
+
+    # Election Participation, one bit per election (see elections.py)
+    participation_mask = models.PositiveSmallIntegerField(default=0)
     
     # Summary Score
     voter_score = models.IntegerField()
 
+    # Fingerprint of the source row, used by incremental loads
+    row_hash = models.CharField(max_length=40, blank=True)
+
+    class Meta:
+        # Every filter of the voter form can be answered from one of these
+        # indexes; see voter_analytics/tests.py for the query plan checks.
+        indexes = [
+            models.Index(fields=['party', 'voter_score', 'birth_year'],
+                         name='voter_party_score_year_idx'),
+            models.Index(fields=['voter_score', 'birth_year'], name='voter_score_year_idx'),
+            models.Index(fields=['birth_year'], name='voter_year_idx'),
+            models.Index(fields=['participation_mask', 'birth_year'], name='voter_participation_idx'),
+            # sort order of seek pagination in VoterListView, unfiltered
+            # and behind the party and voter score filters
+            models.Index(fields=['last_name', 'first_name', 'id'], name='voter_name_idx'),
+            models.Index(fields=['party', 'last_name', 'first_name', 'id'], name='voter_party_name_idx'),
+            models.Index(fields=['voter_score', 'last_name', 'first_name', 'id'], name='voter_score_name_idx'),
+            # first name prefixes of the name search (see search.py)
+            models.Index(fields=['first_name'], name='voter_first_name_idx'),
+        ]
+
     def __str__(self):
         """String representation of the Voter model."""
         return f"{self.first_name} {self.last_name} ({self.party_affiliation})"
 
+    @property
+    def party_affiliation(self):
+        return self.party.code
+
+    @property
+    def precinct_number(self):
+        return self.precinct.number
+
+    @property
+    def street_name(self):
+        return self.street.name
+
+    def voted_in(self, election):
+        """Returns True if this voter took part in `election` (one of ELECTION_FIELDS)."""
+        return bool(self.participation_mask & ELECTION_BITS[election])
 
-def load_data():
+    @property
+    def v20state(self):
+        return self.voted_in('v20state')
+
+    @property
+    def v21town(self):
+        return self.voted_in('v21town')
+
+    @property
+    def v21primary(self):
+        return self.voted_in('v21primary')
+
+    @property
+    def v22general(self):
+        return self.voted_in('v22general')
+
+    @property
+    def v23town(self):
+        return self.voted_in('v23town')
+
+    def save(self, *args, **kwargs):
+        """Keeps birth_year in step with date_of_birth."""
+        self.birth_year = self.date_of_birth.year
+        super().save(*args, **kwargs)
+
+
+class VoterSummary(models.Model):
+    """
+    Number of voters for each combination of the attributes the graphs
+    page can filter on. Rebuilt by the loader from the Voter table.
+    """
+    party = models.ForeignKey(Party, on_delete=models.PROTECT, related_name='+')
+    birth_year = models.IntegerField()
+    voter_score = models.IntegerField()
+    participation_mask = models.PositiveSmallIntegerField()
+    count = models.IntegerField()
+
+    def __str__(self):
+        """String representation of the VoterSummary model."""
+        return (f"{self.count} voters ({self.party}, born {self.birth_year}, "
+                f"score {self.voter_score}, mask {self.participation_mask})")
+
+
+class VoterGeneration(LoadGeneration):
+    """Bumped by the loader every time the Voter table changes."""
+
+
+def load_data(filename, workers=1):
     """
     Loads voter data from a CSV file into the Voter database.
-    
-    This function reads the file line-by-line and creates
-    one object at a time, matching the marathon example style.
+
+    Kept for use from the Django shell; see voter_analytics.loader and
+    the `load_voters` management command.
     """
-    Voter.objects.all().delete()
-
-    filename = r"\Users\victo\Downloads\newton_voters.csv"
-    f = open(filename)
-    f.readline()
-    for line in f:
-        fields = line.split(',')
-       
-        try:
-            # create a new instance of Voter object with this record from CSV
-            voter = Voter(
-                last_name=fields[1],
-                first_name=fields[2],
-                street_number=int(fields[3]),
-                street_name=fields[4],
-                apartment_number=fields[5] if fields[5] else None,
-                zip_code=fields[6],
-                date_of_birth=datetime.strptime(fields[7], '%Y-%m-%d').date(),
-                date_of_registration=datetime.strptime(fields[8], '%Y-%m-%d').date(),
-                party_affiliation=fields[9].strip(),
-                precinct_number=fields[10],
-                v20state=fields[11].strip().upper() == 'TRUE',
-                v21town=fields[12].strip().upper() == 'TRUE',
-                v21primary=fields[13].strip().upper() == 'TRUE',
-                v22general=fields[14].strip().upper() == 'TRUE',
-                v23town=fields[15].strip().upper() == 'TRUE',
-                voter_score=int(fields[16])
-            )
-            voter.save() # Commit this one voter to the database
-        except Exception as e:
-            print(f"--- Skipped line due to error: {e} ---")
-            print(f"--- Offending data: {line} ---")
-    f.close()
\ No newline at end of file
+    from .loader import load_voters
+
+    stats = load_voters(filename, workers=workers)
+    print(f"Done. Loaded {stats['loaded']} voters, rejected {stats['rejected']}.")
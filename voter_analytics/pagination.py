@@ -0,0 +1,120 @@
+# voter_analytics/pagination.py
+# Ting Shing Liu, 10/18/26
+# Keyset (seek) pagination of voters by name
+
+import base64
+import json
+from django.db.models import Q
+
+# Sort order of seek pagination; the pk makes every position unique
+SEEK_ORDERING = ['last_name', 'first_name', 'pk']
+
+
+def encode_cursor(voter):
+    """Returns an opaque, URL-safe cursor for the position of `voter`."""
+    key = [voter.last_name, voter.first_name, voter.pk]
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Returns the (last_name, first_name, pk) position held by `cursor`.
+
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        last_name, first_name, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError(f"invalid cursor {cursor!r}")
+    if not (isinstance(last_name, str) and isinstance(first_name, str) and isinstance(pk, int)):
+        raise ValueError(f"invalid cursor {cursor!r}")
+    return last_name, first_name, pk
+
+
+def after_position(last_name, first_name, pk):
+    """
+    Returns a Q matching voters sorted after the given position.
+
+    The leading last_name__gte term is implied by the rest, but lets the
+    database start from that point of the name index.
+    """
+    return Q(last_name__gte=last_name) & (
+        Q(last_name__gt=last_name)
+        | Q(last_name=last_name, first_name__gt=first_name)
+        | Q(last_name=last_name, first_name=first_name, pk__gt=pk)
+    )
+
+
+def before_position(last_name, first_name, pk):
+    """Returns a Q matching voters sorted before the given position."""
+    return Q(last_name__lte=last_name) & (
+        Q(last_name__lt=last_name)
+        | Q(last_name=last_name, first_name__lt=first_name)
+        | Q(last_name=last_name, first_name=first_name, pk__lt=pk)
+    )
+
+
+class SeekPage:
+    """
+    One page of voters from seek_page(), with the cursors of the pages
+    before and after it (None at either end of the list).
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def seek_page(queryset, per_page, after=None, before=None):
+    """
+    Returns the SeekPage of `per_page` voters from `queryset` that follows
+    the `after` cursor, precedes the `before` cursor, or starts the list.
+
+    Each page is one range query with a LIMIT, and no COUNT is run.
+    Unfiltered, or filtered by party or voter score, the page is read in
+    order from voter_name_idx, voter_party_name_idx or voter_score_name_idx
+    (other filters are checked on the rows read), so its cost does not
+    depend on how deep into the list it is. With only year or election
+    filters the database may instead look up every match after the
+    cursor and sort them, so those pages cost more the more voters match.
+
+    Raises ValueError if a cursor is malformed.
+    """
+    if before:
+        position = decode_cursor(before)
+        descending = ['-' + field for field in SEEK_ORDERING]
+        rows = list(queryset.filter(before_position(*position)).order_by(*descending)[:per_page + 1])
+        more_before = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        if not rows:
+            return SeekPage(rows, None, None)
+        return SeekPage(rows,
+                        next_cursor=encode_cursor(rows[-1]),
+                        previous_cursor=encode_cursor(rows[0]) if more_before else None)
+
+    if after:
+        queryset = queryset.filter(after_position(*decode_cursor(after)))
+    rows = list(queryset.order_by(*SEEK_ORDERING)[:per_page + 1])
+    more_after = len(rows) > per_page
+    rows = rows[:per_page]
+    if not rows:
+        return SeekPage(rows, None, None)
+    return SeekPage(rows,
+                    next_cursor=encode_cursor(rows[-1]) if more_after else None,
+                    previous_cursor=encode_cursor(rows[0]) if after else None)
@@ -0,0 +1,85 @@
+# voter_analytics/parsers.py
+# Ting Shing Liu, 10/18/26
+# Parsing and validation of rows from the Newton voter file
+
+import hashlib
+from datetime import date
+from .elections import ELECTION_FIELDS, participation_mask
+
+# Column order of the voter file (the first column is the voter ID number)
+VOTER_COLUMNS = [
+    'voter_id', 'last_name', 'first_name', 'street_number', 'street_name',
+    'apartment_number', 'zip_code', 'date_of_birth', 'date_of_registration',
+    'party_affiliation', 'precinct_number',
+    'v20state', 'v21town', 'v21primary', 'v22general', 'v23town',
+    'voter_score',
+]
+
+
+def parse_date(text):
+    """Parse a YYYY-MM-DD date from the voter file."""
+    return date.fromisoformat(text.strip())
+
+
+def parse_bool(text):
+    """Parse a TRUE/FALSE flag from the voter file."""
+    value = text.strip().upper()
+    if value not in ('TRUE', 'FALSE'):
+        raise ValueError(f"expected TRUE or FALSE, got {text!r}")
+    return value == 'TRUE'
+
+
+def row_hash(fields):
+    """
+    Returns a fingerprint of a row of the voter file, used to tell
+    whether a voter's record changed between two loads.
+    """
+    normalized = '\x1f'.join(field.strip() for field in fields)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def parse_voter_row(fields):
+    """
+    Converts one row of the voter file (a list of strings) into a dict
+    of Voter field values, including its `row_hash`.
+
+    Raises ValueError if the row is malformed.
+    """
+    if len(fields) != len(VOTER_COLUMNS):
+        raise ValueError(f"expected {len(VOTER_COLUMNS)} columns, got {len(fields)}")
+
+    voter_id = fields[0].strip()
+    if not voter_id:
+        raise ValueError("missing voter ID number")
+
+    last_name = fields[1].strip()
+    first_name = fields[2].strip()
+    if not last_name or not first_name:
+        raise ValueError("missing voter name")
+
+    party = fields[9].strip()
+    if len(party) > 2:
+        raise ValueError(f"invalid party affiliation {party!r}")
+
+    voter_score = int(fields[16])
+    if not 0 <= voter_score <= len(ELECTION_FIELDS):
+        raise ValueError(f"voter score {voter_score} out of range")
+
+    date_of_birth = parse_date(fields[7])
+    return {
+        'voter_id': voter_id,
+        'row_hash': row_hash(fields),
+        'last_name': last_name,
+        'first_name': first_name,
+        'street_number': int(fields[3]),
+        'street_name': fields[4].strip(),
+        'apartment_number': fields[5].strip() or None,
+        'zip_code': fields[6].strip(),
+        'date_of_birth': date_of_birth,
+        'birth_year': date_of_birth.year,
+        'date_of_registration': parse_date(fields[8]),
+        'party_affiliation': party,
+        'precinct_number': fields[10].strip(),
+        'participation_mask': participation_mask(parse_bool(text) for text in fields[11:16]),
+        'voter_score': voter_score,
+    }
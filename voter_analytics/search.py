@@ -0,0 +1,226 @@
+# voter_analytics/search.py
+# Ting Shing Liu, 10/18/26
+# Name search over voters, backed by the SQLite FTS5 trigram index
+#
+# The index (voter_analytics_voter_fts) is created by migration 0009 with
+# the SQL below and kept in sync by triggers. On other databases, or if the index is
+# missing, names are matched with LIKE prefixes of the name indexes instead.
+
+from contextlib import contextmanager
+from django.db import connection
+from django.db.models import Q
+from .models import Voter
+
+FTS_TABLE = 'voter_analytics_voter_fts'
+
+# Migrations 0009, 0010 and 0011 hold copies of the SQL below as it was
+# when they were written. Changing it here needs a new migration that
+# recreates the table or triggers.
+
+# An FTS5 index of voter names with the trigram tokenizer, which matches
+# any substring of three or more characters. It stores no copy of the
+# names (content=...) and is kept in sync with the Voter table by triggers.
+FTS_CREATE_TABLE = f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+    last_name, first_name,
+    content='voter_analytics_voter', content_rowid='id', tokenize='trigram')"""
+
+# Re-indexes every voter
+FTS_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+# The triggers that keep the index in sync, by name
+FTS_TRIGGERS = {
+    'voter_analytics_voter_fts_insert': """
+        AFTER INSERT ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(rowid, last_name, first_name)
+            VALUES (new.id, new.last_name, new.first_name);
+        END""",
+    'voter_analytics_voter_fts_delete': """
+        AFTER DELETE ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts, rowid, last_name, first_name)
+            VALUES ('delete', old.id, old.last_name, old.first_name);
+        END""",
+    'voter_analytics_voter_fts_update': """
+        AFTER UPDATE OF last_name, first_name ON voter_analytics_voter BEGIN
+            INSERT INTO voter_analytics_voter_fts(voter_analytics_voter_fts, rowid, last_name, first_name)
+            VALUES ('delete', old.id, old.last_name, old.first_name);
+            INSERT INTO voter_analytics_voter_fts(rowid, last_name, first_name)
+            VALUES (new.id, new.last_name, new.first_name);
+        END""",
+}
+
+
+def create_trigger_sql():
+    """Returns the statements creating the index's triggers."""
+    return [f"CREATE TRIGGER IF NOT EXISTS {name} {body}" for name, body in FTS_TRIGGERS.items()]
+
+
+def drop_trigger_sql():
+    """Returns the statements dropping the index's triggers."""
+    return [f"DROP TRIGGER IF EXISTS {name}" for name in FTS_TRIGGERS]
+
+
+# Default and largest number of results returned by a search
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Rows fetched from the index and re-ranked in Python per search
+CANDIDATES = 200
+
+
+def trigrams(text):
+    """Returns the set of three-letter substrings of `text`, ignoring case."""
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(word, name):
+    """
+    Scores how well one query word matches a name, from 0 to 2: the
+    share of trigrams they have in common, plus 1 if the name starts
+    with the word.
+    """
+    word = word.lower()
+    name = name.lower()
+    score = 1.0 if name.startswith(word) else 0.0
+    word_trigrams = trigrams(word)
+    if word_trigrams:
+        name_trigrams = trigrams(name)
+        score += len(word_trigrams & name_trigrams) / len(word_trigrams | name_trigrams)
+    return score
+
+
+def score_voter(words, voter):
+    """Adds up each query word's best match against the voter's names."""
+    return sum(max(similarity(word, voter.last_name), similarity(word, voter.first_name))
+               for word in words)
+
+
+def quote(text):
+    """Quotes `text` as an FTS5 string."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+# Whether the index exists, checked on the first search
+_fts_available = None
+
+
+def fts_available():
+    """Returns True if the FTS5 name index exists in this database."""
+    global _fts_available
+    if _fts_available is None:
+        _fts_available = connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+    return _fts_available
+
+
+@contextmanager
+def name_index_suspended():
+    """
+    Drops the index's triggers while the block runs, then rebuilds the
+    index in one pass and restores the triggers.
+
+    Used around full reloads of the Voter table, where rebuilding once is
+    much faster than updating the index row by row. Run it inside a
+    transaction so readers never see the index without its triggers.
+    """
+    if not fts_available():
+        yield
+        return
+    with connection.cursor() as cursor:
+        for sql in drop_trigger_sql():
+            cursor.execute(sql)
+    yield
+    with connection.cursor() as cursor:
+        for sql in [FTS_REBUILD] + create_trigger_sql():
+            cursor.execute(sql)
+
+
+def like_prefix(word):
+    """Returns a LIKE pattern matching text that starts with `word`."""
+    return word.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+def fts_candidates(match, short_words, limit):
+    """
+    Returns the pks of up to `limit` voters matching the FTS5 query
+    `match` whose first or last name also starts with each of
+    `short_words`, best bm25 first.
+    """
+    table = Voter._meta.db_table
+    where = [f"{FTS_TABLE} MATCH %s"]
+    params = [match]
+    for word in short_words:
+        where.append(f"({table}.last_name LIKE %s ESCAPE '\\' OR {table}.first_name LIKE %s ESCAPE '\\')")
+        params += [like_prefix(word)] * 2
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {FTS_TABLE}.rowid FROM {FTS_TABLE} JOIN {table} ON {table}.id = {FTS_TABLE}.rowid "
+            f"WHERE {' AND '.join(where)} ORDER BY bm25({FTS_TABLE}) LIMIT %s", params + [limit])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def candidate_pks(words):
+    """
+    Returns the pks of voters that may match the query `words`, or None
+    if no word is long enough to look up in the index.
+
+    Words of three or more letters are first looked up as substrings of
+    the names (every word must match). If that finds too few voters, any
+    voter sharing a trigram with the query is considered, which is what
+    lets misspelled names match. Shorter words can't be looked up in a
+    trigram index and are matched as name prefixes.
+    """
+    long_words = [word for word in words if len(word) >= 3]
+    short_words = [word for word in words if len(word) < 3]
+    if not long_words:
+        return None
+
+    pks = fts_candidates(' AND '.join(quote(word) for word in long_words), short_words, CANDIDATES)
+    if len(pks) < SEARCH_LIMIT:
+        grams = sorted(set().union(*(trigrams(word) for word in long_words)))
+        seen = set(pks)
+        pks += [pk for pk in fts_candidates(' OR '.join(quote(gram) for gram in grams), short_words, CANDIDATES)
+                if pk not in seen]
+    return pks
+
+
+def prefix_filter(words):
+    """
+    Returns a Q matching voters with a first or last name starting with
+    each word. The name columns use NOCASE collation, so each word is a
+    range of voter_name_idx or voter_first_name_idx.
+    """
+    q = Q()
+    for word in words:
+        q &= Q(last_name__istartswith=word) | Q(first_name__istartswith=word)
+    return q
+
+
+def search_voters(query, limit=SEARCH_LIMIT):
+    """
+    Returns (score, voter) pairs for up to `limit` voters whose first or
+    last name match `query`, best match first.
+
+    Matches are ranked by how much of each query word appears in the
+    voter's names, with names starting with the word ranked highest.
+    """
+    words = query.split()
+    if not words:
+        return []
+
+    pks = candidate_pks(words) if fts_available() else None
+    if pks is None:
+        voters = Voter.objects.select_related('party', 'street').filter(prefix_filter(words))
+        voters = list(voters.order_by('last_name', 'first_name', 'pk')[:CANDIDATES])
+    else:
+        found = Voter.objects.select_related('party', 'street').in_bulk(pks)
+        voters = [found[pk] for pk in pks if pk in found]
+
+    # voters often share names, so each name pair is only scored once
+    scores = {}
+    for voter in voters:
+        name = (voter.last_name, voter.first_name)
+        if name not in scores:
+            scores[name] = score_voter(words, voter)
+    scored = [(scores[(voter.last_name, voter.first_name)], voter) for voter in voters]
+    scored.sort(key=lambda pair: (-pair[0], pair[1].last_name, pair[1].first_name, pair[1].pk))
+    return [(score, voter) for score, voter in scored[:limit]]
@@ -1,3 +1,544 @@
+# voter_analytics/tests.py
+# Ting Shing Liu, 10/18/26
+# Tests for the Voter Analytics app
+
+import base64
+import csv
+import itertools
+import os
+import random
+import tempfile
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.http import QueryDict, StreamingHttpResponse
 from django.test import TestCase
+from django.urls import reverse
+from cs412.histograms import histogram
+from .aggregates import voter_filter_options, voter_graph_data
+from .bitmaps import VoterBitmaps
+from .columnar import VoterColumns, np
+from .elections import ELECTION_BITS, ELECTION_FIELDS
+from .filters import FILTER_PARAMS, normalize_filters, voter_filter
+from .loader import load_voters
+from .models import Party, Voter, VoterGeneration, VoterSummary
+from .pagination import SEEK_ORDERING, after_position, seek_page
+from .search import FTS_TABLE, FTS_TRIGGERS, prefix_filter, search_voters
+from .parsers import VOTER_COLUMNS
+
+# A valid row of the voter file, changed per test by voter_row()
+SAMPLE_VOTER_ROW = {
+    'voter_id': '00000001X', 'last_name': 'SMITH', 'first_name': 'JOHN',
+    'street_number': '12', 'street_name': 'MAIN ST', 'apartment_number': '',
+    'zip_code': '02459', 'date_of_birth': '1960-05-01', 'date_of_registration': '2010-01-01',
+    'party_affiliation': 'D', 'precinct_number': '1',
+    'v20state': 'TRUE', 'v21town': 'FALSE', 'v21primary': 'FALSE', 'v22general': 'TRUE',
+    'v23town': 'TRUE', 'voter_score': '3',
+}
+
+# A sample value for every parameter of the filter form
+SAMPLE_FILTER_VALUES = {
+    'party': 'D',
+    'min_year': '1950',
+    'max_year': '1990',
+    'voter_score': '3',
+    'v20state': 'True',
+    'v21town': 'True',
+    'v21primary': 'True',
+    'v22general': 'True',
+    'v23town': 'True',
+}
+
+
+def voter_row(voter_id, **changes):
+    """Returns the fields of a voter file row for `voter_id`, with `changes` applied."""
+    row = dict(SAMPLE_VOTER_ROW, voter_id=voter_id, **changes)
+    return [row[name] for name in VOTER_COLUMNS]
+
+
+class VoterFileMixin:
+    """Writes voter files to a temporary directory removed after the test."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_voter_file(self, rows, name='voters.csv'):
+        """Writes a header and `rows` (lists of fields) and returns the file's path."""
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(VOTER_COLUMNS)
+            writer.writerows(rows)
+        return path
+
+    def read_rejects(self, path):
+        """Returns the rows of a reject file, without its header."""
+        with open(path, newline='', encoding='utf-8') as f:
+            return list(csv.reader(f))[1:]
+
+
+def filter_combinations():
+    """Yields every non-empty combination of the filter form's parameters."""
+    for size in range(1, len(FILTER_PARAMS) + 1):
+        yield from itertools.combinations(FILTER_PARAMS, size)
+
+
+def sample_params(combination):
+    """Returns the filter form's GET parameters for a combination of filters."""
+    params = QueryDict(mutable=True)
+    for name in combination:
+        params[name] = SAMPLE_FILTER_VALUES[name]
+    return params
+
+
+class VoterIndexUsageTests(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN for each combination of voter filters and
+    checks that none of them falls back to scanning the whole table.
+    """
+
+    def assert_no_full_scan(self, queryset):
+        plan = queryset.explain()
+        for line in plan.splitlines():
+            if f"SCAN {Voter._meta.db_table}" in line:
+                self.fail(f"full scan in plan:\n{plan}\n{queryset.query}")
+
+    def test_every_filter_combination_uses_an_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("query plan checks are written for SQLite")
+        for combination in filter_combinations():
+            with self.subTest(filters=combination):
+                self.assert_no_full_scan(Voter.objects.filter(voter_filter(sample_params(combination))))
+
+    def test_seek_pages_are_read_in_name_order(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("query plan checks are written for SQLite")
+        # year and election filters alone are left out: their matches may be sorted (see seek_page)
+        for combination in [(), ('party',), ('voter_score',), ('party', 'voter_score', 'min_year', 'v20state')]:
+            voters = Voter.objects.filter(voter_filter(sample_params(combination)))
+            page = voters.filter(after_position('SMITH', 'JOHN', 1)).order_by(*SEEK_ORDERING)[:101]
+            with self.subTest(filters=combination):
+                self.assert_no_full_scan(page)
+                self.assertNotIn("USE TEMP B-TREE", page.explain())
+
+
+class VoterLoaderTests(VoterFileMixin, TestCase):
+    """Loads small voter files and checks the Voter table and reject file."""
+
+    def test_repeated_voter_id_is_rejected(self):
+        repeated = voter_row('00000001X', last_name='JONES')
+        path = self.write_voter_file([voter_row('00000001X'), voter_row('00000002X'), repeated])
+
+        stats = load_voters(path)
+
+        self.assertEqual(stats['loaded'], 2)
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(self.read_rejects(stats['reject_filename']),
+                         [['4'] + repeated + ['repeated voter ID number']])
+        self.assertEqual(Voter.objects.get(voter_id='00000001X').last_name, 'SMITH')
+
+    def test_reload_without_a_party_removes_it(self):
+        first = self.write_voter_file([voter_row('00000001X'), voter_row('00000002X', party_affiliation='R')])
+        second = self.write_voter_file([voter_row('00000001X')], name='second.csv')
+        for incremental in [False, True]:
+            with self.subTest(incremental=incremental):
+                load_voters(first)
+                load_voters(second, incremental=incremental)
+                self.assertEqual(list(Party.objects.values_list('code', flat=True)), ['D'])
+                self.assertEqual(list(VoterSummary.objects.values_list('party__code', flat=True)), ['D'])
+
+    def test_incremental_load_applies_only_the_differences(self):
+        unchanged, changed, removed = voter_row('00000001X'), voter_row('00000002X'), voter_row('00000003X')
+        load_voters(self.write_voter_file([unchanged, changed, removed]))
+        unchanged_pk = Voter.objects.get(voter_id='00000001X').pk
+
+        second = self.write_voter_file([
+            unchanged,
+            voter_row('00000002X', last_name='JONES', street_name='ELM ST'),
+            voter_row('00000004X', first_name='ANN'),
+        ], name='second.csv')
+        stats = load_voters(second, incremental=True)
+
+        self.assertEqual({name: stats[name] for name in ['inserted', 'updated', 'deleted', 'unchanged', 'loaded']},
+                         {'inserted': 1, 'updated': 1, 'deleted': 1, 'unchanged': 1, 'loaded': 3})
+        voters = {v.voter_id: v for v in Voter.objects.select_related('street')}
+        self.assertEqual(sorted(voters), ['00000001X', '00000002X', '00000004X'])
+        self.assertEqual(voters['00000001X'].pk, unchanged_pk)
+        self.assertEqual((voters['00000002X'].last_name, voters['00000002X'].street_name), ('JONES', 'ELM ST'))
+        self.assertEqual(voters['00000004X'].first_name, 'ANN')
+
+        # loading the same file again changes nothing
+        stats = load_voters(second, incremental=True)
+        self.assertEqual((stats['unchanged'], stats['inserted'], stats['updated'], stats['deleted']), (3, 0, 0, 0))
+
+
+class SeekPaginationTests(VoterFileMixin, TestCase):
+    """Pages through voters with cursors, across runs of identical names."""
+
+    def setUp(self):
+        super().setUp()
+        names = [('SMITH', 'JOHN')] * 5 + [('ADAMS', 'ANN')] * 2 + [('SMITH', 'AMY'), ('ZHANG', 'WEI')]
+        rows = [voter_row(f'{i:08d}X', last_name=last, first_name=first)
+                for i, (last, first) in enumerate(names)]
+        load_voters(self.write_voter_file(rows))
+        self.ordered = list(Voter.objects.order_by(*SEEK_ORDERING))
+
+    def test_forward_and_backward_round_trip(self):
+        for per_page in [1, 2, 3, 4]:
+            with self.subTest(per_page=per_page):
+                pages = [seek_page(Voter.objects.all(), per_page)]
+                while pages[-1].has_next():
+                    pages.append(seek_page(Voter.objects.all(), per_page, after=pages[-1].next_cursor))
+                self.assertEqual([v for page in pages for v in page], self.ordered)
+                self.assertFalse(pages[0].has_previous())
+
+                # walking back from the last page returns the same pages
+                back = [pages[-1]]
+                while back[-1].has_previous():
+                    back.append(seek_page(Voter.objects.all(), per_page, before=back[-1].previous_cursor))
+                self.assertEqual([list(page) for page in back[::-1]], [list(page) for page in pages])
+
+    def test_bad_cursor_is_404(self):
+        wrong_types = base64.urlsafe_b64encode(b'["SMITH", "JOHN", "1"]').decode('ascii')
+        not_a_list = base64.urlsafe_b64encode(b'5').decode('ascii')
+        for cursor in ['not a cursor', '%%%', wrong_types, not_a_list, '\u00e9']:
+            for name in ['after', 'before']:
+                with self.subTest(cursor=cursor, name=name):
+                    response = self.client.get(reverse('voters'), {name: cursor})
+                    self.assertEqual(response.status_code, 404)
+
+    def test_list_view_pages_with_cursors(self):
+        response = self.client.get(reverse('voters'), {'seek': '1'})
+        page = response.context['page_obj']
+        self.assertEqual(list(page), self.ordered[:len(page)])
+
+
+def random_voter_rows(rng, ids):
+    """Returns voter file rows for `ids` with random parties, birth years, scores and elections."""
+    return [voter_row(
+        f'{i:08d}X',
+        party_affiliation=rng.choice(['D', 'R', 'U', 'J']),
+        date_of_birth=f'{rng.randint(1940, 2000)}-06-15',
+        voter_score=str(rng.randint(0, 5)),
+        **{name: rng.choice(['TRUE', 'FALSE']) for name in ELECTION_FIELDS}) for i in ids]
+
+
+class EngineParityTests(VoterFileMixin, TestCase):
+    """
+    Checks that the columnar and bitmap engines select the same voters
+    as voter_filter() for every combination of filters.
+    """
+
+    def setUp(self):
+        super().setUp()
+        load_voters(self.write_voter_file(random_voter_rows(random.Random(412), range(200))))
+        self.generation = VoterGeneration.current()
+
+    def orm_pks(self, params):
+        return list(Voter.objects.filter(voter_filter(params)).order_by('pk').values_list('pk', flat=True))
+
+    def check_engine(self, engine, matching_pks):
+        for combination in filter_combinations():
+            params = sample_params(combination)
+            with self.subTest(engine=type(engine).__name__, filters=combination):
+                expected = self.orm_pks(params)
+                self.assertEqual(matching_pks(engine, normalize_filters(params)), expected)
+                self.assertEqual(engine.count(normalize_filters(params)), len(expected))
+
+    def test_bitmap_engine(self):
+        def matching_pks(bitmaps, filters):
+            bitmap = bitmaps.match(filters)
+            return [bitmaps.pks[i] for i in bitmaps.positions(bitmap, 0, len(bitmaps))]
+        self.check_engine(VoterBitmaps(self.generation), matching_pks)
+
+    def test_bitmaps_take_about_one_bit_per_voter(self):
+        bitmaps = VoterBitmaps(self.generation)
+        count = 1 + len(bitmaps.elections) + sum(len(values) for values in bitmaps.bitmaps.values())
+        # each bitmap is len(bitmaps) bits plus an int's fixed overhead
+        bitmap_limit = count * (len(bitmaps) // 8 + 64)
+        self.assertLessEqual(bitmaps.nbytes(), bitmap_limit + 8 * len(bitmaps))
+
+    def test_columnar_engine(self):
+        if np is None:
+            self.skipTest("the columnar engine needs NumPy")
+        self.check_engine(VoterColumns(self.generation),
+                          lambda columns, filters: columns.matching_pks(filters).tolist())
+
+    def test_unknown_party_matches_nobody(self):
+        params = QueryDict('party=XX')
+        self.assertEqual(self.orm_pks(params), [])
+        self.assertEqual(VoterBitmaps(self.generation).count(normalize_filters(params)), 0)
+        if np is not None:
+            self.assertEqual(VoterColumns(self.generation).count(normalize_filters(params)), 0)
+
+
+class VoterGraphDataTests(VoterFileMixin, TestCase):
+    """
+    Checks the graph data added up from VoterSummary against aggregates
+    computed directly from Voter, after a full and an incremental load.
+    """
+
+    def direct_graph_data(self, params, year_bin_width):
+        voters = Voter.objects.filter(voter_filter(params))
+        parties = voters.values_list('party__code').annotate(count=Count('pk')).order_by()
+        masks = list(voters.values_list('participation_mask', flat=True))
+        return {
+            'birth_years': histogram(voters, 'birth_year', year_bin_width),
+            'parties': dict(parties),
+            'elections': [sum(1 for mask in masks if mask & bit) for bit in ELECTION_BITS.values()],
+        }
+
+    def assert_matches_voters(self):
+        for combination in [()] + list(filter_combinations()):
+            params = sample_params(combination)
+            # yearly bins for an even number of filters, decades for an odd number
+            year_bin_width = 10 if len(combination) % 2 else 1
+            with self.subTest(filters=combination, year_bin_width=year_bin_width):
+                data = voter_graph_data(params, year_bin_width)
+                expected = self.direct_graph_data(params, year_bin_width)
+                self.assertEqual(data['birth_years'], expected['birth_years'])
+                self.assertEqual(dict(data['parties']), expected['parties'])
+                counts = [count for party, count in data['parties']]
+                self.assertEqual(counts, sorted(counts, reverse=True))
+                self.assertEqual(data['elections'], expected['elections'])
+
+    def test_summary_matches_voters(self):
+        rng = random.Random(412)
+        load_voters(self.write_voter_file(random_voter_rows(rng, range(200))))
+        self.assert_matches_voters()
+
+        # the second file drops a quarter of the voters, changes the rest and adds new ones
+        second = self.write_voter_file(random_voter_rows(rng, range(50, 260)), name='second.csv')
+        stats = load_voters(second, incremental=True)
+        self.assertEqual((stats['deleted'], stats['inserted']), (50, 60))
+        self.assertEqual(Voter.objects.count(), 210)
+        self.assert_matches_voters()
+
+
+class VoterFilterOptionsTests(VoterFileMixin, TestCase):
+    """The filter form's choices are read once per VoterGeneration."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        load_voters(self.write_voter_file([voter_row('00000001X'), voter_row('00000002X', voter_score='1')]))
+
+    def test_second_call_only_reads_the_generation(self):
+        expected = {'party_options': ['D'], 'score_options': [3, 1]}
+        self.assertEqual(voter_filter_options(), expected)
+        with self.assertNumQueries(1):
+            self.assertEqual(voter_filter_options(), expected)
+
+    def test_new_parties_appear_after_a_bump(self):
+        self.assertEqual(voter_filter_options()['party_options'], ['D'])
+        VoterSummary.objects.create(party=Party.objects.create(code='R'), birth_year=1970, voter_score=0,
+                                    participation_mask=0, count=1)
+        self.assertEqual(voter_filter_options()['party_options'], ['D'])
+
+        VoterGeneration.bump()
+        self.assertEqual(voter_filter_options(), {'party_options': ['D', 'R'], 'score_options': [3, 1, 0]})
+
+        # a load bumps the generation itself
+        load_voters(self.write_voter_file([voter_row('00000003X', party_affiliation='U')], name='second.csv'))
+        self.assertEqual(voter_filter_options()['party_options'], ['U'])
+
+
+class VoterGraphDataViewTests(VoterFileMixin, TestCase):
+    """Fetches graphs.json and checks its payload, ETag and invalidation by VoterGeneration."""
+
+    def setUp(self):
+        super().setUp()
+        # generations restart in every test, so drop responses cached by other tests
+        cache.clear()
+        load_voters(self.write_voter_file([
+            voter_row('00000001X'),
+            voter_row('00000002X', party_affiliation='R', date_of_birth='1975-03-01', v20state='FALSE'),
+        ]))
+
+    def get(self, **headers):
+        return self.client.get(reverse('graphs_json'), {'year_bin': '10'}, headers=headers)
+
+    def test_payload(self):
+        data = self.get().json()
+        self.assertEqual(data['birth_years'], {'x': [1960, 1970], 'y': [1, 1], 'bin_width': 10})
+        self.assertEqual(sorted(data['parties']['labels']), ['D', 'R'])
+        self.assertEqual(data['elections']['values'], [1, 0, 0, 2, 2])
+
+    def test_etag_and_not_modified(self):
+        first = self.get()
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first['ETag'])
+        self.assertIn('max-age=300', first['Cache-Control'])
+
+        # a cached response costs only the generation lookup
+        with self.assertNumQueries(1):
+            again = self.get(if_none_match=first['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+        self.assertEqual(again['ETag'], first['ETag'])
+
+    def test_new_generation_invalidates(self):
+        first = self.get()
+        Voter.objects.filter(voter_id='00000002X').update(voter_score=5)
+        # until the generation moves on, the cached data is served
+        self.assertEqual(self.get().json(), first.json())
+
+        # load_voters() rebuilds the summary and bumps VoterGeneration
+        load_voters(self.write_voter_file([voter_row('00000001X')], name='second.csv'))
+        second = self.get(if_none_match=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual(second.json()['parties']['labels'], ['D'])
+
+        # VoterGeneration.bump() alone also moves every cached response to a new key
+        VoterGeneration.bump()
+        self.assertNotEqual(self.get(if_none_match=second['ETag'])['ETag'], second['ETag'])
+
+
+class VoterExportViewTests(VoterFileMixin, TestCase):
+    """Downloads export.csv and compares it with the voters matching the filters."""
+
+    def setUp(self):
+        super().setUp()
+        self.rows = random_voter_rows(random.Random(412), range(100))
+        load_voters(self.write_voter_file(self.rows))
+
+    def export(self, params):
+        response = self.client.get(reverse('voters_csv'), params)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="voters.csv"')
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        return list(csv.reader(lines))
+
+    def test_export_matches_the_filters(self):
+        for params in [{}, {'party': 'D'}, {'party': 'R', 'min_year': '1960', 'v22general': 'True'}]:
+            with self.subTest(params=params):
+                header, *rows = self.export(params)
+                self.assertEqual(header, VOTER_COLUMNS)
+                self.assertEqual(len(rows), Voter.objects.filter(voter_filter(params)).count())
+                if 'party' in params:
+                    self.assertEqual({row[VOTER_COLUMNS.index('party_affiliation')] for row in rows},
+                                     {params['party']})
+
+    def test_rows_are_in_the_voter_file_format(self):
+        header, *rows = self.export({})
+        self.assertEqual(rows, self.rows)
+
+
+class VoterSearchTests(VoterFileMixin, TestCase):
+    """Searches voter names and checks the index follows changes to Voter."""
+
+    def setUp(self):
+        super().setUp()
+        names = [('SMITH', 'JOHN'), ('SMITHERS', 'ANN'), ('JONES', 'PATRICK'), ('PATEL', 'JOHN')]
+        load_voters(self.write_voter_file([voter_row(f'{i:08d}X', last_name=last, first_name=first)
+                                           for i, (last, first) in enumerate(names)]))
+
+    def names(self, query):
+        return [(voter.last_name, voter.first_name) for score, voter in search_voters(query)]
+
+    def indexed_pks(self, word):
+        """Returns the pks the index holds for names containing `word`, if the index exists."""
+        if connection.vendor != 'sqlite':
+            self.skipTest("the name index is SQLite only")
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rowid",
+                           [f'"{word}"'])
+            return [row[0] for row in cursor.fetchall()]
+
+    def test_search_ranks_prefixes_first(self):
+        self.assertEqual(self.names('smith')[:2], [('SMITH', 'JOHN'), ('SMITHERS', 'ANN')])
+        self.assertEqual(self.names('john smith')[0], ('SMITH', 'JOHN'))
+        # short words are matched as name prefixes
+        self.assertEqual(self.names('jo pat'), [('PATEL', 'JOHN'), ('JONES', 'PATRICK')])
+
+    def test_short_words_use_the_name_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("query plan checks are written for SQLite")
+        voters = Voter.objects.filter(prefix_filter(['jo', 'pa'])).order_by('last_name', 'first_name', 'pk')
+        self.assertEqual([(v.last_name, v.first_name) for v in voters], [('JONES', 'PATRICK'), ('PATEL', 'JOHN')])
+        plan = voters.explain()
+        self.assertFalse([line for line in plan.splitlines() if f"SCAN {Voter._meta.db_table}" in line], plan)
+        self.assertIn("voter_name_idx", plan)
+        self.assertIn("voter_first_name_idx", plan)
+
+    def test_search_tolerates_typos(self):
+        self.assertEqual(self.names('smiht')[0][0], 'SMITH')
+        self.assertEqual(self.names('jonse')[0], ('JONES', 'PATRICK'))
+
+    def test_full_load_restores_the_triggers(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("the name index is SQLite only")
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' ORDER BY name")
+            self.assertEqual([row[0] for row in cursor.fetchall()], sorted(FTS_TRIGGERS))
+
+    def test_index_follows_insert_update_and_delete(self):
+        template = Voter.objects.get(last_name='SMITH')
+        voter = Voter.objects.get(pk=template.pk)
+        voter.pk = None
+        voter.voter_id = '00000099X'
+        voter.last_name = 'QUIGLEY'
+        voter.save()
+        self.assertEqual(self.indexed_pks('QUIGLEY'), [voter.pk])
+
+        voter.last_name = 'WOZNIAK'
+        voter.save()
+        self.assertEqual(self.indexed_pks('QUIGLEY'), [])
+        self.assertEqual(self.indexed_pks('WOZNIAK'), [voter.pk])
+        self.assertEqual(self.names('wozniak'), [('WOZNIAK', 'JOHN')])
+
+        voter.delete()
+        self.assertEqual(self.indexed_pks('WOZNIAK'), [])
+        self.assertEqual(self.names('wozniak'), [])
+
+
+class VoterTurnoutTests(VoterFileMixin, TestCase):
+    """Checks the turnout crosstab and its CSV form against a small voter file."""
+
+    def setUp(self):
+        super().setUp()
+        # the cache outlives each test's database, whose generations restart
+        cache.clear()
+        voters = [
+            ('1', 'D', 'TRUE FALSE FALSE TRUE TRUE'),
+            ('1', 'D', 'TRUE TRUE FALSE FALSE FALSE'),
+            ('1', 'R', 'FALSE FALSE FALSE FALSE FALSE'),
+            ('2', 'D', 'TRUE TRUE TRUE TRUE TRUE'),
+        ]
+        rows = [voter_row(f'{i:08d}X', precinct_number=precinct, party_affiliation=party,
+                          **dict(zip(ELECTION_FIELDS, flags.split())))
+                for i, (precinct, party, flags) in enumerate(voters)]
+        load_voters(self.write_voter_file(rows))
+
+    def test_crosstab_counts(self):
+        turnout = self.client.get(reverse('turnout_api')).json()
+        self.assertEqual([election['name'] for election in turnout['elections']], ELECTION_FIELDS)
+        self.assertEqual(turnout['rows'], [
+            {'precinct': '1', 'party': 'D', 'voters': 2,
+             'voted': [2, 1, 0, 1, 1], 'turnout': [1.0, 0.5, 0.0, 0.5, 0.5]},
+            {'precinct': '1', 'party': 'R', 'voters': 1,
+             'voted': [0, 0, 0, 0, 0], 'turnout': [0.0, 0.0, 0.0, 0.0, 0.0]},
+            {'precinct': '2', 'party': 'D', 'voters': 1,
+             'voted': [1, 1, 1, 1, 1], 'turnout': [1.0, 1.0, 1.0, 1.0, 1.0]},
+        ])
+
+    def test_csv_matches_json(self):
+        turnout = self.client.get(reverse('turnout_api')).json()
+        response = self.client.get(reverse('turnout_api'), {'format': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        header, *rows = csv.reader(response.content.decode('utf-8').splitlines())
 
-# Create your tests here.
+        self.assertEqual(header[:3], ['precinct', 'party', 'voters'])
+        self.assertEqual(len(rows), len(turnout['rows']))
+        for row, expected in zip(rows, turnout['rows']):
+            record = dict(zip(header, row))
+            self.assertEqual((record['precinct'], record['party'], int(record['voters'])),
+                             (expected['precinct'], expected['party'], expected['voters']))
+            for name, voted, rate in zip(ELECTION_FIELDS, expected['voted'], expected['turnout']):
+                self.assertEqual(int(record[f"{name}_voted"]), voted)
+                self.assertEqual(float(record[f"{name}_turnout"]), rate)
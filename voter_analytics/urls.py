@@ -9,4 +9,8 @@ urlpatterns = [
     path('', views.VoterListView.as_view(), name='voters'), # maps the base URL to the VoterListView
     path('voter/<int:pk>', views.VoterDetailView.as_view(), name='voter'), # maps the URL with voter ID to the VoterDetailView
     path('graphs', views.VoterGraphView.as_view(), name='graphs'), # maps the URL for graphs to the VoterGraphView
+    path('export.csv', views.VoterExportView.as_view(), name='voters_csv'), # the filtered voters as a CSV download
+    path('search.json', views.VoterSearchView.as_view(), name='voter_search'), # ranked name search
+    path('api/turnout', views.VoterTurnoutView.as_view(), name='turnout_api'), # turnout by precinct, party and election
+    path('graphs.json', views.VoterGraphDataView.as_view(), name='graphs_json'), # chart data for the graphs page
 ]
\ No newline at end of file
@@ -2,69 +2,88 @@
 # Ting Shing Liu, 10/31/25
 # Views for Voter Analytics app
 
+import csv
+import io
 from datetime import datetime
 from django.shortcuts import render
 from django.db.models.query import QuerySet
 from django.shortcuts import render
 from django.views.generic import ListView, DetailView
-from . models import Voter
-import plotly
-import plotly.graph_objs as go 
-from django.db.models import Count, Q
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.views import View
+from . models import Voter, VoterGeneration
+from .aggregates import voter_filter_options, voter_graph_series, voter_turnout, voter_turnout_csv_rows
+from .engines import get_engine
+from .exports import voter_export_rows
+from .filters import filter_signature, normalize_filters, parse_int, voter_filter
+from .pagination import seek_page
+from .search import MAX_SEARCH_LIMIT, SEARCH_LIMIT, search_voters
+from cs412.charts import plotly_js_url
+from cs412.generations import cache_key, cached_json_response, get_or_compute
+from cs412.pagination import CachedCountMixin
 
 # Create your views here.
-class VoterListView(ListView):
+class VoterListView(CachedCountMixin, ListView):
+    """
+    Lists voters matching the filter form, 100 per page.
+
+    Pages are numbered (?page=) by default, and the number of voters
+    matching each filter is cached until the next load. With ?seek=1,
+    ?after= or ?before= the list is sorted by name and paginated with
+    cursors instead, which keeps deep pages as cheap as the first one
+    when no filter or a party or voter score filter is used (see seek_page).
+    """
     model = Voter
     template_name = 'voter_analytics/voter_list.html'
     context_object_name = 'voters'
     paginate_by = 100
 
+    # GET parameters that control paging rather than filtering
+    paging_params = ['page', 'seek', 'after', 'before']
+
+    @cached_property
+    def generation(self):
+        """The VoterGeneration this request's cached data belongs to."""
+        return VoterGeneration.current()
+
+    def get_count_key(self):
+        """Caches counts per filter signature and load generation."""
+        return cache_key('voter_count', self.generation, filter_signature(self.request.GET))
+
+    def seek_mode(self):
+        """Returns True if this request asked for cursor pagination."""
+        return any(self.request.GET.get(name) for name in ['seek', 'after', 'before'])
+
+    def paginate_queryset(self, queryset, page_size):
+        """Uses seek pagination when requested, else Django's Paginator."""
+        if not self.seek_mode():
+            return super().paginate_queryset(queryset, page_size)
+        try:
+            page = seek_page(queryset, page_size,
+                             after=self.request.GET.get('after'),
+                             before=self.request.GET.get('before'))
+        except ValueError:
+            raise Http404("Invalid page cursor.")
+        return (None, page, page.object_list, page.has_other_pages())
+
     def get_queryset(self):
         """
         Overrides the default queryset to implement filtering.
+
+        With an in-memory engine enabled (see engines.py), numbered pages
+        are filtered by the engine and only the voters on the page are
+        read from the database.
         """
-        # Start with all voters
-        queryset = super().get_queryset()
-
-        # Get filter parameters from the request's GET dictionary
-        party = self.request.GET.get('party')
-        min_year = self.request.GET.get('min_year')
-        max_year = self.request.GET.get('max_year')
-        score = self.request.GET.get('voter_score')
-        
-        # Election checkboxes
-        v20state = self.request.GET.get('v20state')
-        v21town = self.request.GET.get('v21town')
-        v21primary = self.request.GET.get('v21primary')
-        v22general = self.request.GET.get('v22general')
-        v23town = self.request.GET.get('v23town')
-
-        # Apply filters if they are present and not empty
-        if party:
-            queryset = queryset.filter(party_affiliation=party)
-        
-        if min_year:
-            queryset = queryset.filter(date_of_birth__year__gte=min_year)
-            
-        if max_year:
-            queryset = queryset.filter(date_of_birth__year__lte=max_year)
-            
-        if score:
-            queryset = queryset.filter(voter_score=score)
-
-        # Apply checkbox filters (only filter if the box is checked)
-        if v20state:
-            queryset = queryset.filter(v20state=True)
-        if v21town:
-            queryset = queryset.filter(v21town=True)
-        if v21primary:
-            queryset = queryset.filter(v21primary=True)
-        if v22general:
-            queryset = queryset.filter(v22general=True)
-        if v23town:
-            queryset = queryset.filter(v23town=True)
-            
-        return queryset
+        engine = get_engine(self.generation)
+        if engine is not None and not self.seek_mode():
+            return engine.results(normalize_filters(self.request.GET))
+
+        # Start with all voters, then apply the filter form's parameters
+        # (party and street names are shown for every voter on the page)
+        queryset = super().get_queryset().select_related('party', 'street')
+        return queryset.filter(voter_filter(self.request.GET))
 
     def get_context_data(self, **kwargs):
         """
@@ -73,13 +92,9 @@ class VoterListView(ListView):
         # Get the default context
         context = super().get_context_data(**kwargs)
         
-        # Add data for filter <select> options to the context
-        
-        # Get distinct party affiliations from the DB
-        context['party_options'] = Voter.objects.values_list('party_affiliation', flat=True).distinct().order_by('party_affiliation')
-        
-        # Get distinct voter scores from the DB
-        context['score_options'] = Voter.objects.values_list('voter_score', flat=True).distinct().order_by('-voter_score')
+        # Add data for filter <select> options to the context:
+        # 'party_options' and 'score_options', cached until the next load
+        context.update(voter_filter_options(self.generation))
         
         # Generate a list of years for the date of birth dropdowns
         current_year = datetime.now().year
@@ -88,18 +103,42 @@ class VoterListView(ListView):
         # Pass current filter values back to the template 
         # This allows the form to "remember" the user's selections
         context['current_filters'] = self.request.GET
+
+        # The filters alone, for building paging links
+        filter_query = self.request.GET.copy()
+        for name in self.paging_params:
+            filter_query.pop(name, None)
+        context['filter_query'] = filter_query.urlencode()
+        context['seek_mode'] = self.seek_mode()
         
         return context
 
 class VoterDetailView(DetailView):
     model = Voter
+    queryset = Voter.objects.select_related('party', 'precinct', 'street')
     template_name = 'voter_analytics/voter_detail.html'
     context_object_name = 'voter'
 
+# Years per bar offered for the birth year histogram; the first is the default
+YEAR_BIN_OPTIONS = [1, 2, 5, 10]
+
+
+def get_year_bin_width(params):
+    """Returns the histogram bin width from ?year_bin=, if it is one of the options."""
+    year_bin_width = parse_int(params.get('year_bin'))
+    if year_bin_width in YEAR_BIN_OPTIONS:
+        return year_bin_width
+    return YEAR_BIN_OPTIONS[0]
+
+
 class VoterGraphView(VoterListView):
     """
     A view that inherits from VoterListView to display
     graphs based on the filtered data.
+
+    The page only holds the filter form and empty chart divs; the
+    browser fetches the chart data from VoterGraphDataView and draws
+    the charts with plotly.js.
     """
     # Use a new template
     template_name = 'voter_analytics/graphs.html'
@@ -109,83 +148,113 @@ class VoterGraphView(VoterListView):
 
     def get_context_data(self, **kwargs):
         """
-        1. Calls the parent (VoterListView) to get all the
-           filter options context.
-        2. Gets the filtered queryset.
-        3. Generates graphs based on that queryset.
-        4. Adds the graph HTML to the context.
+        Adds the chart data URL for the current filters, the histogram
+        bin options and the plotly.js URL to the filter form context.
         """
         # Get the base context from VoterListView
         # This will include 'party_options', 'year_options', etc.
         context = super().get_context_data(**kwargs)
-        
-        # Get the fully filtered queryset
-        # self.get_queryset() runs the inherited method with all
-        # the same request.GET logic.
-        filtered_qs = self.get_queryset()
 
-        # Generate Graphs
-        
-        # Graph 1: Birth Year Histogram 
-        # Get a list of all birth years from the filtered queryset
-        birth_years = list(filtered_qs.values_list('date_of_birth__year', flat=True))
-        
-        if birth_years:
-            fig1 = go.Figure(
-                data=[go.Histogram(x=birth_years)]
-            )
-            fig1.update_layout(
-                title_text='Voter Distribution by Birth Year',
-                xaxis_title='Birth Year',
-                yaxis_title='Count'
-            )
-            # Convert to HTML div
-            context['birth_year_graph'] = plotly.offline.plot(fig1, auto_open=False, output_type="div")
-        
-        # Graph 2: Party Affiliation Pie Chart 
-        # Get a count of each party, grouped by party
-        party_data = filtered_qs.values('party_affiliation').annotate(
-            count=Count('party_affiliation')
-        ).order_by('-count')
-        
-        if party_data:
-            fig2 = go.Figure(
-                data=[go.Pie(
-                    labels=[item['party_affiliation'] for item in party_data], 
-                    values=[item['count'] for item in party_data]
-                )]
-            )
-            fig2.update_layout(title_text='Voter Distribution by Party Affiliation')
-            # Convert to HTML div
-            context['party_pie_chart'] = plotly.offline.plot(fig2, auto_open=False, output_type="div")
-
-        # Graph 3: Election Participation Bar Chart 
-        # Aggregate counts for each election column where the value is True
-        election_counts = filtered_qs.aggregate(
-            v20state=Count('pk', filter=Q(v20state=True)),
-            v21town=Count('pk', filter=Q(v21town=True)),
-            v21primary=Count('pk', filter=Q(v21primary=True)),
-            v22general=Count('pk', filter=Q(v22general=True)),
-            v23town=Count('pk', filter=Q(v23town=True)),
-        )
-
-        if election_counts:
-            elections = ['20 State', '21 Town', '21 Primary', '22 General', '23 Town']
-            counts = [
-                election_counts['v20state'],
-                election_counts['v21town'],
-                election_counts['v21primary'],
-                election_counts['v22general'],
-                election_counts['v23town']
-            ]
-            
-            fig3 = go.Figure(data=[go.Bar(x=elections, y=counts)])
-            fig3.update_layout(
-                title_text='Voter Participation by Election',
-                xaxis_title='Election',
-                yaxis_title='Number of Voters'
-            )
-            # Convert to HTML div
-            context['election_bar_chart'] = plotly.offline.plot(fig3, auto_open=False, output_type="div")
-
-        return context
\ No newline at end of file
+        context['year_bin_width'] = get_year_bin_width(self.request.GET)
+        context['year_bin_options'] = YEAR_BIN_OPTIONS
+        context['graph_data_url'] = f"{reverse('graphs_json')}?{self.request.GET.urlencode()}"
+
+        # The charts share one cached copy of plotly.js loaded by the template
+        context['plotly_js_url'] = plotly_js_url()
+
+        return context
+
+
+class VoterGraphDataView(View):
+    """
+    Returns the series behind the graphs page as JSON for the filters in
+    the query string.
+
+    Responses are cached under the normalized filter signature and the
+    current VoterGeneration, and carry a matching ETag, so repeated
+    requests for a filter cost neither a query over the summary table
+    nor a response body.
+    """
+
+    def get_cache_key(self, request):
+        year_bin_width = get_year_bin_width(request.GET)
+        signature = f"{filter_signature(request.GET)}&year_bin={year_bin_width}"
+        return cache_key('voter_graphs', VoterGeneration.current(), signature)
+
+    def get(self, request):
+        year_bin_width = get_year_bin_width(request.GET)
+        return cached_json_response(request, self.get_cache_key(request),
+                                    lambda: voter_graph_series(request.GET, year_bin_width))
+
+
+class Echo:
+    """A file-like object whose write() returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+class VoterExportView(View):
+    """
+    Streams the voters matching the filter form as a CSV file.
+
+    Rows are written to the response as they are read from the database,
+    so the download starts at once and large exports use constant memory.
+    """
+
+    def get(self, request):
+        writer = csv.writer(Echo())
+        rows = (writer.writerow(row) for row in voter_export_rows(request.GET))
+        response = StreamingHttpResponse(rows, content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="voters.csv"'
+        return response
+
+
+class VoterSearchView(View):
+    """
+    Returns the voters whose names best match ?q= as JSON.
+
+    Accepts name prefixes and misspelled names; ?limit= sets the number
+    of results (at most MAX_SEARCH_LIMIT).
+    """
+
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        limit = parse_int(request.GET.get('limit')) or SEARCH_LIMIT
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        results = [{
+            'id': voter.pk,
+            'first_name': voter.first_name,
+            'last_name': voter.last_name,
+            'street_number': voter.street_number,
+            'street_name': voter.street_name,
+            'party_affiliation': voter.party_affiliation,
+            'url': reverse('voter', kwargs={'pk': voter.pk}),
+            'score': round(score, 3),
+        } for score, voter in search_voters(query, limit)]
+        return JsonResponse({'query': query, 'results': results})
+
+
+class VoterTurnoutView(View):
+    """
+    Returns turnout by precinct, party and election as JSON, or as CSV
+    with ?format=csv.
+
+    The crosstab is computed once per load and cached until the next one.
+    """
+
+    def get(self, request):
+        generation = VoterGeneration.current()
+        key = cache_key('voter_turnout', generation)
+        if request.GET.get('format') != 'csv':
+            return cached_json_response(request, key, voter_turnout)
+
+        def compute_csv():
+            out = io.StringIO()
+            csv.writer(out).writerows(voter_turnout_csv_rows(get_or_compute(key, voter_turnout)))
+            return out.getvalue()
+
+        response = HttpResponse(get_or_compute(cache_key('voter_turnout_csv', generation), compute_csv),
+                                content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="turnout.csv"'
+        return response